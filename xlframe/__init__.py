@@ -1,5 +1,6 @@
 from .style import *
 from .xlframe import *
+from .workbook import *
 
 
 if __name__ == '__main__':
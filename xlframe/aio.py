@@ -0,0 +1,137 @@
+import asyncio as _asyncio
+
+__all__ = []
+
+# Bytes buffered before being passed to the event loop.
+CHUNK_SIZE = 1 << 16
+# Chunks waiting to be read before the export is paused.
+MAX_CHUNKS = 16
+
+
+class QueueWriter:
+
+    def __init__(self, loop, queue, chunk_size=CHUNK_SIZE):
+        """
+        Unseekable binary file that passes what is written to an asyncio.Queue.
+        Written to from an executor thread. Blocks while the queue is full.
+
+        :param loop: Event loop queue belongs to.
+        :param queue: Queue to put chunks on.
+        :type queue: asyncio.Queue
+        :param chunk_size: Bytes buffered before putting them on the queue.
+        :type chunk_size: int
+        """
+        self.loop = loop
+        self.queue = queue
+        self.chunk_size = chunk_size
+        self.buffer = bytearray()
+        self.cancelled = False
+        self.closed = False
+
+    def write(self, data):
+        if self.closed:
+            # Export was stopped. Anything written while it unwinds is dropped.
+            return len(data)
+        self.buffer += data
+        if len(self.buffer) >= self.chunk_size:
+            self.flush()
+        return len(data)
+
+    def flush(self):
+        if self.buffer:
+            self.put(bytes(self.buffer))
+            del self.buffer[:]
+
+    def put(self, item):
+        if self.closed:
+            return
+        if self.cancelled:
+            self.closed = True
+            raise ValueError('Stream closed.')
+        _asyncio.run_coroutine_threadsafe(self.queue.put(item), self.loop).result()
+
+
+class ExcelStream:
+
+    def __init__(self, export, executor=None, chunk_size=CHUNK_SIZE, max_chunks=MAX_CHUNKS):
+        """
+        Async iterator of the bytes written by export. export runs on executor once iteration starts.
+        Bytes are available as soon as they are written so the start of the file can be sent
+        while the rest is generated.
+
+        Iterate to the end or call aclose() so the export isn't left waiting for a reader.
+
+        :param export: Writes file. Called with an unseekable binary file object.
+        :type export: callable
+        :param executor: concurrent.futures executor to run export on. Loop's default executor if unspecified.
+            Must be threads, the file can't be passed to another process.
+        :param chunk_size: Minimum bytes in each chunk, apart from the last.
+        :type chunk_size: int
+        :param max_chunks: Chunks to hold before pausing export until they're read.
+        :type max_chunks: int
+        """
+        self.export = export
+        self.executor = executor
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.queue = None
+        self.writer = None
+        self.future = None
+
+    def _start(self):
+        loop = _asyncio.get_event_loop()
+        self.queue = _asyncio.Queue(self.max_chunks)
+        self.writer = QueueWriter(loop, self.queue, self.chunk_size)
+        self.future = loop.run_in_executor(self.executor, self._run)
+
+    def _run(self):
+        self.export(self.writer)
+        self.writer.flush()
+        self.writer.put(None)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.future is None:
+            self._start()
+        if self.queue.empty() and not self.future.done():
+            # Wait for the next chunk, or for export to fail.
+            get = _asyncio.ensure_future(self.queue.get())
+            await _asyncio.wait([get, self.future], return_when=_asyncio.FIRST_COMPLETED)
+            if get.done():
+                return await self._chunk(get.result())
+            get.cancel()
+        if self.queue.empty():
+            self.future.result()
+            raise StopAsyncIteration
+        return await self._chunk(self.queue.get_nowait())
+
+    async def _chunk(self, chunk):
+        if chunk is None:
+            await self.future
+            raise StopAsyncIteration
+        return chunk
+
+    async def aclose(self):
+        """
+        Stop export and discard anything not read yet.
+        """
+        if self.future is None or self.future.done():
+            return
+        self.writer.cancelled = True
+        while not self.future.done():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            await _asyncio.wait([self.future], timeout=0.05)
+        self.future.exception()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+
+if __name__ == '__main__':
+    pass
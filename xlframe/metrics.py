@@ -0,0 +1,165 @@
+from functools import lru_cache as _lru_cache
+
+import numpy as _np
+import pandas as _pd
+
+__all__ = []
+
+# Advance widths in 1/1000 em of printable ASCII, space (32) to tilde (126). Adobe core font metrics.
+_HELVETICA = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_BOLD = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+_TIMES = (
+    250, 333, 408, 500, 500, 833, 778, 180, 333, 333, 500, 564, 250, 333, 250, 278,
+    500, 500, 500, 500, 500, 500, 500, 500, 500, 500, 278, 278, 564, 564, 564, 444,
+    921, 722, 667, 667, 722, 611, 556, 722, 722, 333, 389, 722, 611, 889, 722, 722,
+    556, 722, 667, 556, 611, 722, 722, 944, 722, 722, 611, 333, 278, 333, 469, 500,
+    333, 444, 500, 444, 500, 444, 333, 500, 500, 278, 278, 500, 278, 778, 500, 500,
+    500, 500, 333, 389, 278, 500, 500, 722, 500, 500, 444, 480, 200, 480, 541,
+)
+_TIMES_BOLD = (
+    250, 333, 555, 500, 500, 1000, 833, 278, 333, 333, 500, 570, 250, 333, 250, 278,
+    500, 500, 500, 500, 500, 500, 500, 500, 500, 500, 333, 333, 570, 570, 570, 500,
+    930, 722, 667, 722, 722, 667, 611, 778, 778, 389, 500, 778, 667, 944, 722, 778,
+    611, 778, 722, 556, 667, 722, 722, 1000, 722, 722, 667, 333, 278, 333, 581, 500,
+    333, 500, 556, 444, 556, 444, 333, 500, 556, 278, 333, 556, 278, 833, 556, 500,
+    556, 556, 444, 389, 333, 556, 500, 722, 500, 500, 444, 394, 220, 394, 520,
+)
+_COURIER = (600,) * 95
+
+# (regular, bold) widths by family.
+FAMILIES = {
+    'helvetica': (_HELVETICA, _HELVETICA_BOLD),
+    'times': (_TIMES, _TIMES_BOLD),
+    'courier': (_COURIER, _COURIER),
+}
+
+# Family and scale used for each of utils.FontStyles.
+# Arial, Times New Roman and Courier New share their family's metrics.
+# The rest are approximations from each font's average width relative to its family.
+FONTS = {
+    'Arial': ('helvetica', 1.0),
+    'Baskerville Old Face': ('times', 1.0),
+    'Bodoni MT': ('times', 1.02),
+    'Calibri': ('helvetica', 0.9),
+    'Consolas': ('courier', 0.917),
+    'Courier New': ('courier', 1.0),
+    'Garamond': ('times', 0.95),
+    'Gill Sans MT': ('helvetica', 0.9),
+    'Leeawadee': ('helvetica', 0.95),
+    'Lucida Console': ('courier', 1.0),
+    'Rockwell': ('times', 1.08),
+    'Segoe UI': ('helvetica', 0.97),
+    'Tahoma': ('helvetica', 0.98),
+    'Times New Roman': ('times', 1.0),
+    'Trebuchet MS': ('helvetica', 0.95),
+    'Tw Cen MT': ('helvetica', 0.82),
+    'Verdana': ('helvetica', 1.12),
+}
+# Family for fonts not listed.
+DEFAULT_FONT = ('helvetica', 1.0)
+
+# Code point ranges of full width characters (CJK, Hangul, full width forms). 1 em each.
+_WIDE = (
+    (0x1100, 0x115F), (0x2E80, 0xA4CF), (0xAC00, 0xD7A3), (0xF900, 0xFAFF), (0xFE30, 0xFE4F),
+    (0xFF00, 0xFF60), (0xFFE0, 0xFFE6), (0x20000, 0x3FFFD),
+)
+
+
+@_lru_cache(maxsize=None)
+def glyph_widths(font_name, bold=False):
+    """
+    Advance widths for font in 1/1000 em, indexed by code point below 128.
+    Other characters that aren't full width are given the average lowercase letter width.
+
+    :param font_name: Font name.
+    :type font_name: str
+    :param bold: Bold font.
+    :type bold: bool
+    :return: (numpy.ndarray of widths, width of other characters)
+    :rtype: tuple
+    """
+    family, scale = FONTS.get(font_name, DEFAULT_FONT)
+    printable = _np.array(FAMILIES[family][bool(bold)], dtype=float) * scale
+    other = printable[ord('a') - 32:ord('z') - 31].mean()
+    table = _np.zeros(128)
+    table[32:127] = printable
+    return table, other
+
+
+def text_widths(texts, font_name, size, bold=False):
+    """
+    Width of each text in points.
+
+    :param texts: Texts to measure.
+    :type texts: list of str
+    :param font_name: Font name.
+    :type font_name: str
+    :param size: Font size in points.
+    :type size: float
+    :param bold: Bold font.
+    :type bold: bool
+    :return: numpy.ndarray
+    """
+    table, other = glyph_widths(font_name, bool(bold))
+    lengths = _np.fromiter(map(len, texts), dtype=_np.int64, count=len(texts))
+    codes = _np.frombuffer(''.join(texts).encode('utf-32-le'), dtype=_np.uint32)
+
+    advances = _np.where(codes < 128, table[_np.minimum(codes, 127)], other)
+    for start, stop in _WIDE:
+        advances[(codes >= start) & (codes <= stop)] = 1000
+
+    totals = _np.concatenate(([0.0], _np.cumsum(advances)))
+    ends = _np.cumsum(lengths)
+    return (totals[ends] - totals[ends - lengths]) * size / 1000
+
+
+@_lru_cache(maxsize=4096)
+def text_width(text, font_name, size, bold=False):
+    """
+    Width of text in points. See text_widths.
+
+    :return: float
+    """
+    return float(text_widths([text], font_name, size, bold)[0])
+
+
+def digit_width(font_name, size, bold=False):
+    """
+    Width of '0' in points. Excel column widths are measured in digits of the workbook's default font.
+
+    :return: float
+    """
+    return text_width('0', font_name, size, bold)
+
+
+def max_text_width(values, font_name, size, bold=False):
+    """
+    Width of the widest value as a string, in points. Each distinct value is only measured once.
+
+    :param values: Values to measure.
+    :type values: numpy.ndarray
+    :return: float
+    """
+    distinct = _pd.unique(values)
+    if not len(distinct):
+        return 0.0
+    texts = [value if type(value) is str else str(value) for value in distinct]
+    return float(text_widths(texts, font_name, size, bold).max())
+
+
+if __name__ == '__main__':
+    pass
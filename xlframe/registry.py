@@ -0,0 +1,483 @@
+from copy import copy as _copy
+
+import numpy as _np
+import pandas as _pd
+from openpyxl.descriptors.serialisable import Serialisable as _Serialisable
+from openpyxl.styles.cell_style import StyleArray as _StyleArray
+from openpyxl.styles.named_styles import BUILTIN_FORMATS_MAX_SIZE as _BUILTIN_FORMATS_MAX_SIZE, \
+    BUILTIN_FORMATS_REVERSE as _BUILTIN_FORMATS_REVERSE
+
+from .style import Style as _Style
+
+__all__ = []
+
+CODE_DTYPE = _np.int32
+
+_SCALARS = {str, int, float, bool}
+# Fields of each openpyxl style class, by class.
+_FIELDS = dict()
+
+
+def runs(codes):
+    """
+    Run length encode codes.
+
+    :param codes: Style codes.
+    :type codes: 1D numpy.ndarray
+    :return: (start, stop, code) for each run of identical codes.
+    :rtype: iterator of tuple
+    """
+    if not len(codes):
+        return iter(())
+    starts = _np.concatenate(([0], _np.flatnonzero(codes[1:] != codes[:-1]) + 1))
+    stops = _np.append(starts[1:], len(codes))
+    return zip(starts.tolist(), stops.tolist(), codes[starts])
+
+
+def fingerprint(style):
+    """
+    Canonical structural key of style. Everything that affects how cells look, not its name.
+    Styles with equal fingerprints format cells the same.
+
+    :param style: Style to key.
+    :type style: openpyxl.styles.NamedStyle
+    :return: tuple
+    """
+    return (style.number_format,) + tuple(
+        _key(getattr(style, element)) for element in ('font', 'fill', 'border', 'alignment', 'protection')
+    )
+
+
+def _key(value):
+    kind = type(value)
+    if value is None or kind in _SCALARS:
+        return value
+    fields = _FIELDS.get(kind)
+    if fields is None:
+        if isinstance(value, (list, tuple)):
+            return tuple([_key(item) for item in value])
+        if not isinstance(value, _Serialisable):
+            return value
+        fields = _FIELDS[kind] = value.__attrs__ + value.__elements__
+    return (kind.__name__,) + tuple([_key(getattr(value, field)) for field in fields])
+
+
+def split_name(name):
+    """
+    Split numbered style name into name and number. 'Style[2]' -> ('Style', 2), 'Style' -> ('Style', 0).
+
+    :param name: Style name.
+    :type name: str
+    :return: (name, number)
+    :rtype: tuple
+    """
+    if name[-1] != ']':
+        return name, 0
+    try:
+        return name[:name.rindex('[')], int(name[name.rindex('[') + 1:-1])
+    except ValueError:  # substring not found or invalid input to int() found.
+        return name, 0
+
+
+class NameCounter:
+
+    def __init__(self, names=()):
+        """
+        Highest number used with each base name, to number new style names without searching for a free one.
+
+        :param names: Names already taken.
+        :type names: iterable of str
+        """
+        self._highest = dict()
+        for name in names:
+            self.add(name)
+
+    def add(self, name):
+        """
+        Record name as taken.
+
+        :param name: Style name.
+        :type name: str
+        :return: None
+        """
+        base, number = split_name(name)
+        if number > self._highest.get(base, -1):
+            self._highest[base] = number
+
+    def next_name(self, name, taken=()):
+        """
+        Take the next numbered name for name. 'Style[n]' with n above any number used with 'Style' so far.
+
+        :param name: Style name to number.
+        :type name: str
+        :param taken: Names to also avoid. Only checked in case names were taken without being added.
+        :type taken: container of str
+        :return: New name
+        :rtype: str
+        """
+        base, number = split_name(name)
+        number = max(number, self._highest.get(base, 0)) + 1
+        new_name = '{}[{}]'.format(base, number)
+        while new_name in taken:
+            number += 1
+            new_name = '{}[{}]'.format(base, number)
+        self._highest[base] = number
+        return new_name
+
+    def copy(self):
+        counter = NameCounter()
+        counter._highest = self._highest.copy()
+        return counter
+
+
+def add_named_styles(book, styles, key=fingerprint):
+    """
+    Add named styles to an openpyxl workbook in one pass. See register_named_styles.
+
+    :param book: openpyxl workbook
+    :param styles: Styles to add.
+    :type styles: iterable of openpyxl.styles.NamedStyle
+    :param key: Gets the fingerprint of each of styles.
+    :type key: callable
+    :return: dict mapping old name: new name for styles that had to be renamed.
+    """
+    styles = list(styles)
+    names = register_named_styles(book, styles, key=key)
+    return {style.name: name for style, name in zip(styles, names) if name != style.name}
+
+
+def register_named_styles(book, styles, key=fingerprint):
+    """
+    Add named styles to an openpyxl workbook in one pass and get the name each ends up under in book.
+
+    A style already in book under the same name and fingerprint is skipped. Other name clashes are renamed,
+    reusing a style numbered from the same name with the same fingerprint if book has one.
+    Names and fingerprints of book's styles are indexed once, so nothing is checked against every style in book.
+
+    :param book: openpyxl workbook
+    :param styles: Styles to add. Styles that clash are copied to rename them, the rest are added as they are.
+    :type styles: iterable of openpyxl.styles.NamedStyle
+    :param key: Gets the fingerprint of each of styles.
+    :type key: callable
+    :return: Name in book for each of styles.
+    :rtype: list of str
+    """
+    named_styles = book._named_styles
+    existing = {style.name: style for style in named_styles}
+    # name: fingerprint and (base name, fingerprint): name of book's styles. Only needed once a name clashes.
+    keys = index = counter = None
+    names = []
+
+    for style in styles:
+        style_key = None
+        names.append(style.name)
+        if style.name in existing:
+            style_key = key(style)
+            if index is None:
+                keys = {name: fingerprint(other) for name, other in existing.items()}
+                index = dict()
+                for name, other_key in keys.items():
+                    index.setdefault((split_name(name)[0], other_key), name)
+                counter = NameCounter(existing)
+            if keys[style.name] == style_key:
+                continue
+            found = index.get((split_name(style.name)[0], style_key))
+            if found is not None:
+                names[-1] = found
+                continue
+            # Problem with _copy(style). Using _Style(style).named_style as a way to create a copy.
+            new_style = _Style(style).named_style
+            new_style.name = names[-1] = counter.next_name(style.name, existing)
+            style = new_style
+
+        # Same as book.add_named_style without checking the name against every style in book.
+        style._set_index(len(named_styles))
+        list.append(named_styles, style)
+        style.bind(book)
+        existing[style.name] = style
+        if index is not None:
+            keys[style.name] = style_key or key(style)
+            index.setdefault((split_name(style.name)[0], keys[style.name]), style.name)
+            counter.add(style.name)
+    return names
+
+
+def unnamed_format(book, style):
+    """
+    Add style's font, fill, border, alignment, protection and number format to book as a cell format
+    without adding a named style. Cells using it are based on the workbook's first named style, normally Normal.
+
+    :param book: openpyxl workbook
+    :param style: Style to add.
+    :type style: openpyxl.styles.NamedStyle
+    :return: Style array to give cells.
+    :rtype: openpyxl.styles.cell_style.StyleArray
+    """
+    array = _StyleArray()
+    array.fontId = book._fonts.add(style.font)
+    array.borderId = book._borders.add(style.border)
+    array.fillId = book._fills.add(style.fill)
+    array.protectionId = book._protections.add(style.protection)
+    array.alignmentId = book._alignments.add(style.alignment)
+    number_format = style.number_format
+    if number_format in _BUILTIN_FORMATS_REVERSE:
+        array.numFmtId = _BUILTIN_FORMATS_REVERSE[number_format]
+    else:
+        array.numFmtId = book._number_formats.add(number_format) + _BUILTIN_FORMATS_MAX_SIZE
+    return array
+
+
+def apply_style(cell, style):
+    """
+    Style openpyxl cell as exported by XlFrame._export_style_names.
+
+    :param cell: Cell to style.
+    :param style: Named style name or unnamed format.
+    :type style: str or openpyxl.styles.cell_style.StyleArray
+    :return: None
+    """
+    if isinstance(style, str):
+        cell.style = style
+    else:
+        cell._style = _copy(style)
+
+
+class StyleRegistry:
+
+    def __init__(self, styles=None):
+        """
+        Named styles indexed by integer code.
+        Codes are positions in the registry and never change once assigned,
+        so arrays of codes stay valid as more styles are added.
+
+        Behaves as a read only mapping of style name: openpyxl.styles.NamedStyle.
+
+        Styles are interned by fingerprint when added. Each distinct fingerprint gets an integer id,
+        so comparing registered styles is an integer comparison and styles that only differ by name are found
+        with a dict lookup. Styles must not be changed once added.
+
+        :param styles: Initial styles.
+        :type styles: iterable of openpyxl.styles.NamedStyle
+        """
+        self._styles = []
+        self._codes = dict()
+        self._names = None
+        self.counter = NameCounter()
+        # Fingerprint id of each code, fingerprint: id, and fingerprint and codes of each id.
+        self._ids = []
+        self._interned = dict()
+        self._keys = []
+        self._shared = []
+        if styles is not None:
+            for style in styles:
+                self.add(style)
+
+    def add(self, style):
+        """
+        Register style under its name.
+
+        :param style: Style to add.
+        :type style: openpyxl.styles.NamedStyle
+        :return: Style code
+        :rtype: numpy.int32
+        """
+        if style.name in self._codes:
+            raise KeyError('Style by name "{}" already exists'.format(style.name))
+        self._codes[style.name] = code = CODE_DTYPE(len(self._styles))
+        self._styles.append(style)
+        self._names = None
+        self.counter.add(style.name)
+
+        key = fingerprint(style)
+        style_id = self._interned.get(key)
+        if style_id is None:
+            self._interned[key] = style_id = len(self._shared)
+            self._keys.append(key)
+            self._shared.append([])
+        self._ids.append(style_id)
+        self._shared[style_id].append(code)
+        return code
+
+    def code(self, name):
+        """
+        :param name: Style name.
+        :type name: str
+        :return: Style code
+        :rtype: numpy.int32
+        """
+        try:
+            return self._codes[name]
+        except KeyError:
+            raise KeyError('Style by name {} not found.'.format(name))
+
+    def style(self, code):
+        """
+        :param code: Style code.
+        :type code: int
+        :return: openpyxl.styles.NamedStyle
+        """
+        return self._styles[code]
+
+    def name(self, code):
+        """
+        :param code: Style code.
+        :type code: int
+        :return: Style name
+        :rtype: str
+        """
+        return self._styles[code].name
+
+    def style_id(self, style):
+        """
+        Fingerprint id of style. Registered styles are looked up, others are fingerprinted.
+
+        :param style: Style code, name or style.
+        :type style: int, str or openpyxl.styles.NamedStyle
+        :return: Fingerprint id, None if no registered style has the same fingerprint.
+        :rtype: int
+        """
+        if isinstance(style, str):
+            return self._ids[self.code(style)]
+        if not hasattr(style, 'name'):
+            return self._ids[style]
+        code = self._codes.get(style.name)
+        if code is not None and self._styles[code] is style:
+            return self._ids[code]
+        return self._interned.get(fingerprint(style))
+
+    def key(self, style):
+        """
+        Fingerprint of style. Cached for registered styles.
+
+        :param style: Style.
+        :type style: openpyxl.styles.NamedStyle
+        :return: tuple
+        """
+        code = self._codes.get(style.name)
+        if code is not None and self._styles[code] is style:
+            return self._keys[self._ids[code]]
+        return fingerprint(style)
+
+    def equivalent(self, style):
+        """
+        Codes of registered styles with the same fingerprint as style, in the order they were added.
+
+        :param style: Style code, name or style.
+        :type style: int, str or openpyxl.styles.NamedStyle
+        :return: list of style codes
+        """
+        style_id = self.style_id(style)
+        return [] if style_id is None else list(self._shared[style_id])
+
+    def same(self, style1, style2):
+        """
+        Styles have the same name and format cells the same.
+
+        :param style1: Style code, name or style.
+        :type style1: int, str or openpyxl.styles.NamedStyle
+        :param style2: Style code, name or style.
+        :type style2: int, str or openpyxl.styles.NamedStyle
+        :return: bool
+        """
+        id1, id2 = self.style_id(style1), self.style_id(style2)
+        if id1 is None and id2 is None:
+            # Neither has a registered fingerprint. Compare them directly.
+            return self._name(style1) == self._name(style2) and fingerprint(style1) == fingerprint(style2)
+        return id1 == id2 and self._name(style1) == self._name(style2)
+
+    def _name(self, style):
+        if isinstance(style, str):
+            return style
+        if not hasattr(style, 'name'):
+            return self.name(style)
+        return style.name
+
+    @property
+    def names(self):
+        """
+        Style names as an object array indexed by code.
+
+        :return: numpy.ndarray
+        """
+        if self._names is None:
+            self._names = _np.array([style.name for style in self._styles], dtype=object)
+        return self._names
+
+    @property
+    def styles(self):
+        """
+        :return: Styles indexed by code.
+        :rtype: list of openpyxl.styles.NamedStyle
+        """
+        return self._styles
+
+    def decode(self, codes):
+        """
+        Swap style codes for style names.
+
+        :param codes: Style codes.
+        :type codes: int, numpy.ndarray, pandas.Series or pandas.DataFrame
+        :return: Same structure holding style names.
+        """
+        if isinstance(codes, _pd.DataFrame):
+            return _pd.DataFrame(self.names[codes.values], index=codes.index, columns=codes.columns)
+        if isinstance(codes, _pd.Series):
+            return _pd.Series(self.names[codes.values], index=codes.index, name=codes.name)
+        if isinstance(codes, _np.ndarray):
+            return self.names[codes]
+        return self.name(codes)
+
+    def remap(self, codes, func):
+        """
+        Map codes through func. func is called once per distinct code
+        and the results applied to every code with a single lookup.
+        Distinct codes are passed to func in order of first appearance, going down each column in turn.
+
+        :param codes: Style codes.
+        :type codes: numpy.ndarray
+        :param func: Takes a style code and returns its replacement code.
+        :type func: callable
+        :return: Remapped codes with the same shape as codes.
+        :rtype: numpy.ndarray
+        """
+        lookup = _np.arange(len(self._styles), dtype=CODE_DTYPE)
+        distinct, first = _np.unique(codes.ravel(order='F'), return_index=True)
+        for code in distinct[_np.argsort(first)]:
+            lookup[code] = func(code)
+        return lookup[codes]
+
+    def copy(self):
+        registry = StyleRegistry()
+        registry._styles = self._styles.copy()
+        registry._codes = self._codes.copy()
+        registry.counter = self.counter.copy()
+        registry._ids = self._ids.copy()
+        registry._interned = self._interned.copy()
+        registry._keys = self._keys.copy()
+        registry._shared = [codes.copy() for codes in self._shared]
+        return registry
+
+    def get(self, name, default=None):
+        try:
+            return self[name]
+        except KeyError:
+            return default
+
+    def items(self):
+        return ((style.name, style) for style in self._styles)
+
+    def __getitem__(self, name):
+        return self._styles[self.code(name)]
+
+    def __contains__(self, name):
+        return name in self._codes
+
+    def __iter__(self):
+        return iter(self._codes)
+
+    def __len__(self):
+        return len(self._styles)
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,421 @@
+import numpy as _np
+import pandas as _pd
+
+__all__ = []
+
+# Overrides a column can collect before it is stored as one dense array instead.
+MAX_OVERRIDES = 64
+
+
+def _is_full(key):
+    return isinstance(key, slice) and key.start is None and key.stop is None and key.step is None
+
+
+def _length(positions, length):
+    if isinstance(positions, slice):
+        return len(range(*positions.indices(length)))
+    return len(positions)
+
+
+def _as_range(key, length):
+    """
+    Slice of positions with its bounds resolved against length. slice(None) if it covers every position.
+
+    :param key: Slice of positions.
+    :type key: slice
+    :param length: Length of the axis sliced.
+    :type length: int
+    :return: slice
+    """
+    start, stop, step = key.indices(length)
+    if start == 0 and stop == length and step == 1:
+        return slice(None)
+    # Stop is -1 when a negative step runs past the start, which as a slice bound would mean the last position.
+    return slice(start, stop if stop >= 0 else None, step)
+
+
+def _compact(positions):
+    """
+    Positions as a slice when they are increasing and evenly spaced, otherwise unchanged.
+
+    :param positions: Integer positions.
+    :type positions: numpy.ndarray
+    :return: slice or numpy.ndarray
+    """
+    if isinstance(positions, slice) or positions.dtype.kind not in 'iu':
+        return positions
+    if len(positions) < 2:
+        start = int(positions[0]) if len(positions) else 0
+        return slice(start, start + len(positions))
+    step = int(positions[1] - positions[0])
+    if step > 0 and (_np.diff(positions) == step).all():
+        return slice(int(positions[0]), int(positions[-1]) + 1, step)
+    return positions
+
+
+def _positions(axis, key, idx_by):
+    """
+    Resolve key against axis the way pandas would and get the selected positions.
+    Slices and single positions are resolved without building an array of positions for the axis.
+
+    :param axis: Axis being indexed.
+    :type axis: pandas.Index
+    :param key: Key for axis.
+    :param idx_by: 'loc', 'iloc' or None for Series.__getitem__ rules.
+    :type idx_by: str
+    :return: (positions, scalar). positions is a slice or, for fancy indexing, an array.
+        scalar if key selected a single entry.
+    """
+    if _is_full(key):
+        return slice(None), False
+    if idx_by == 'iloc' and isinstance(key, slice):
+        return _as_range(key, len(axis)), False
+    if idx_by == 'loc' and isinstance(key, slice):
+        return _as_range(axis.slice_indexer(key.start, key.stop, key.step), len(axis)), False
+    if idx_by == 'iloc' and _pd.api.types.is_integer(key):
+        position = key + len(axis) if key < 0 else key
+        if not 0 <= position < len(axis):
+            raise IndexError('single positional indexer is out-of-bounds')
+        return slice(position, position + 1), True
+
+    positions = _pd.Series(_np.arange(len(axis)), index=axis)
+    selected = positions[key] if idx_by is None else getattr(positions, idx_by)[key]
+    if isinstance(selected, _pd.Series):
+        # Copied so the selection doesn't keep every position of the axis alive.
+        return _compact(selected.values.copy()), False
+    return slice(selected, selected + 1), True
+
+
+class SparseFrame:
+
+    def __init__(self, fill, index, columns, dtype=None):
+        """
+        Frame stored as a default per column plus overrides for ranges of rows within each column.
+        Memory depends on the number of assignments rather than rows * columns.
+        Only materialized a column at a time when read.
+
+        Indexes like a pandas.DataFrame through .loc, .iloc and [].
+
+        :param fill: Initial value for every column.
+        :param index: Row index.
+        :type index: pandas.Index
+        :param columns: Column index.
+        :type columns: pandas.Index
+        :param dtype: numpy dtype of values.
+        """
+        self.index = index
+        self.columns = columns
+        self.defaults = _np.full(len(columns), fill, dtype=dtype)
+        # per column list of (rows, value). rows a slice or positions. value scalar or array.
+        self.overrides = [[] for _ in range(len(columns))]
+        self.loc = SparseIndexer(self, 'loc')
+        self.iloc = SparseIndexer(self, 'iloc')
+
+    @property
+    def dtype(self):
+        return self.defaults.dtype
+
+    @property
+    def shape(self):
+        return len(self.index), len(self.columns)
+
+    @property
+    def empty(self):
+        return not all(self.shape)
+
+    @property
+    def values(self):
+        return self.take(slice(None), slice(None))
+
+    def column(self, position):
+        """
+        Materialize column at position.
+
+        :param position: Column position.
+        :type position: int
+        :return: numpy.ndarray
+        """
+        values = _np.full(len(self.index), self.defaults[position], dtype=self.dtype)
+        for rows, value in self.overrides[position]:
+            values[rows] = value
+        return values
+
+    def distinct(self):
+        """
+        Distinct values held by cells. Materializes one column at a time.
+
+        :return: 1D numpy.ndarray
+        """
+        if not len(self.index):
+            return self.defaults[:0]
+        return _np.unique(_np.concatenate([self.defaults[:0]] + [self._visible(p) for p in range(len(self.columns))]))
+
+    def _visible(self, position):
+        """
+        Distinct values held by column at position in order of first appearance.
+        Skips defaults and overrides that later overrides hide.
+
+        :param position: Column position.
+        :type position: int
+        :return: 1D numpy.ndarray
+        """
+        if not self.overrides[position] or not len(self.index):
+            return self.defaults[position:position + 1]
+        distinct, first = _np.unique(self.column(position), return_index=True)
+        return distinct[_np.argsort(first)]
+
+    def take(self, rows, cols):
+        """
+        Materialize region.
+
+        :param rows: Row positions.
+        :param cols: Column positions.
+        :return: 2D numpy.ndarray
+        """
+        cols = _np.arange(len(self.columns))[cols]
+        values = _np.empty((_length(rows, len(self.index)), len(cols)), dtype=self.dtype)
+        for i, position in enumerate(cols):
+            values[:, i] = self.column(position)[rows]
+        return values
+
+    def assign(self, rows, cols, value):
+        """
+        Set region to value.
+
+        :param rows: Row positions.
+        :param cols: Column positions.
+        :param value: Scalar or array-like broadcastable to the region.
+        :return: None
+        """
+        cols = _np.arange(len(self.columns))[cols]
+        if isinstance(value, (_pd.DataFrame, _pd.Series)):
+            value = value.values
+        value = _np.asarray(value, dtype=self.dtype)
+
+        if value.ndim:
+            shape = (_length(rows, len(self.index)), len(cols))
+            if value.ndim == 1:
+                value = value.reshape(-1, 1) if shape[1] == 1 else value.reshape(1, -1)
+            value = _np.broadcast_to(value, shape)
+
+        for i, position in enumerate(cols):
+            self._assign_column(rows, position, value[:, i] if value.ndim else value)
+
+    def _assign_column(self, rows, position, value):
+        if _np.ndim(value) and len(value) and (value == value[0]).all():
+            value = value[0]
+        rows = _compact(_np.asarray(rows)) if not isinstance(rows, slice) else rows
+
+        if not _is_full(rows):
+            self.overrides[position].append((rows, value.copy() if _np.ndim(value) else value))
+            if len(self.overrides[position]) > MAX_OVERRIDES:
+                self.overrides[position] = [(slice(None), self.column(position))]
+        elif _np.ndim(value):
+            self.overrides[position] = [(rows, value.copy())]
+        else:
+            self.defaults[position] = value
+            self.overrides[position] = []
+
+    def remap(self, rows, cols, func):
+        """
+        Replace values in region with func(values).
+        When all rows are selected func is given each column's distinct values in order of first appearance,
+        then applied to the defaults and overrides. Hidden defaults and overrides are replaced by any result.
+
+        :param rows: Row positions.
+        :param cols: Column positions.
+        :param func: Takes and returns numpy.ndarray.
+        :type func: callable
+        :return: None
+        """
+        for position in _np.arange(len(self.columns))[cols]:
+            if not _is_full(rows):
+                self._assign_column(rows, position, func(self.column(position)[rows]))
+                continue
+            visible = self._visible(position)
+            order = _np.argsort(visible)
+            keys, results = visible[order], _np.asarray(func(visible), dtype=self.dtype)[order]
+
+            def lookup(values):
+                found = _np.searchsorted(keys, values).clip(max=len(keys) - 1)
+                return _np.where(keys[found] == values, results[found], results[0]).astype(self.dtype)
+
+            self.defaults[position] = lookup(self.defaults[position])
+            self.overrides[position] = [
+                (r, lookup(v) if _np.ndim(v) else lookup(v)[()]) for r, v in self.overrides[position]
+            ]
+
+    def to_frame(self):
+        return _pd.DataFrame(self.values, index=self.index, columns=self.columns)
+
+    def iteritems(self):
+        for position, name in enumerate(self.columns):
+            yield name, _pd.Series(self.column(position), index=self.index, name=name)
+
+    items = iteritems
+
+    def equals(self, other):
+        if isinstance(other, SparseFrame):
+            other = other.to_frame()
+        return self.to_frame().equals(other)
+
+    def __getitem__(self, key):
+        return self.loc[:, key]
+
+    def __setitem__(self, key, value):
+        self.loc[:, key] = value
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __str__(self):
+        return str(self.to_frame())
+
+    def __repr__(self):
+        return repr(self.to_frame())
+
+
+class SparseSeries:
+
+    def __init__(self, fill, index, name=None, dtype=None):
+        """
+        Series stored as a default plus overrides for ranges of rows. See SparseFrame.
+        Indexes like a pandas.Series through .loc, .iloc and [].
+
+        :param fill: Initial value.
+        :param index: Index.
+        :type index: pandas.Index
+        :param name: Series name.
+        :param dtype: numpy dtype of values.
+        """
+        self.name = name
+        self._frame = SparseFrame(fill, index, _pd.Index([name]), dtype=dtype)
+        self.loc = SparseIndexer(self, 'loc')
+        self.iloc = SparseIndexer(self, 'iloc')
+
+    @property
+    def index(self):
+        return self._frame.index
+
+    @property
+    def dtype(self):
+        return self._frame.dtype
+
+    @property
+    def values(self):
+        return self._frame.column(0)
+
+    def take(self, rows):
+        return self._frame.column(0)[rows]
+
+    def assign(self, rows, value):
+        if isinstance(value, _pd.Series):
+            value = value.values
+        self._frame.assign(rows, [0], value)
+
+    def remap(self, rows, func):
+        self._frame.remap(rows, [0], func)
+
+    def to_series(self):
+        return _pd.Series(self.values, index=self.index, name=self.name)
+
+    def iteritems(self):
+        return zip(self.index, self.values)
+
+    items = iteritems
+
+    def equals(self, other):
+        if isinstance(other, SparseSeries):
+            other = other.to_series()
+        return self.to_series().equals(other)
+
+    def __getitem__(self, key):
+        return SparseIndexer(self, None)[key]
+
+    def __setitem__(self, key, value):
+        SparseIndexer(self, None)[key] = value
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __str__(self):
+        return str(self.to_series())
+
+    def __repr__(self):
+        return repr(self.to_series())
+
+
+class SparseIndexer:
+    def __init__(self, obj, idx_by):
+        self._obj = obj
+        self.idx_by = idx_by
+
+    @property
+    def obj(self):
+        if isinstance(self._obj, SparseSeries):
+            return self._obj.to_series()
+        return self._obj.to_frame()
+
+    def _resolve(self, key):
+        if callable(key):
+            key = key(self.obj)
+        if isinstance(self._obj, SparseSeries):
+            return _positions(self._obj.index, key, self.idx_by)
+        if not isinstance(key, tuple):
+            key = (key, slice(None))
+        rows, row_scalar = _positions(self._obj.index, key[0], self.idx_by)
+        cols, col_scalar = _positions(self._obj.columns, key[1], self.idx_by)
+        return rows, row_scalar, cols, col_scalar
+
+    def remap(self, key, func):
+        """
+        Replace values at key with func(values) without materializing more than needed.
+
+        :param key: Same as __getitem__.
+        :param func: Takes and returns numpy.ndarray.
+        :type func: callable
+        :return: None
+        """
+        if isinstance(self._obj, SparseSeries):
+            rows, _ = self._resolve(key)
+            self._obj.remap(rows, func)
+        else:
+            rows, _, cols, _ = self._resolve(key)
+            self._obj.remap(rows, cols, func)
+
+    def __getitem__(self, key):
+        obj = self._obj
+        if isinstance(obj, SparseSeries):
+            rows, row_scalar = self._resolve(key)
+            values = obj.take(rows)
+            if row_scalar:
+                return values[0]
+            return _pd.Series(values, index=obj.index[rows], name=obj.name)
+
+        rows, row_scalar, cols, col_scalar = self._resolve(key)
+        values = obj.take(rows, cols)
+        if row_scalar and col_scalar:
+            return values[0, 0]
+        if row_scalar:
+            return _pd.Series(values[0], index=obj.columns[cols], name=obj.index[rows][0])
+        if col_scalar:
+            return _pd.Series(values[:, 0], index=obj.index[rows], name=obj.columns[cols][0])
+        return _pd.DataFrame(values, index=obj.index[rows], columns=obj.columns[cols])
+
+    def __setitem__(self, key, value):
+        if isinstance(self._obj, SparseSeries):
+            rows, _ = self._resolve(key)
+            self._obj.assign(rows, value)
+        else:
+            rows, _, cols, _ = self._resolve(key)
+            self._obj.assign(rows, cols, value)
+
+
+if __name__ == '__main__':
+    pass
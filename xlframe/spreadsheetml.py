@@ -0,0 +1,521 @@
+from copy import copy as _copy
+from datetime import date as _date, datetime as _datetime
+from tempfile import TemporaryFile as _TemporaryFile
+from xml.sax.saxutils import escape as _escape
+from zipfile import ZIP_DEFLATED as _ZIP_DEFLATED, ZipFile as _ZipFile
+
+import numpy as _np
+from openpyxl import Workbook as _Workbook
+from openpyxl.cell.cell import ERROR_CODES as _ERROR_CODES, ILLEGAL_CHARACTERS_RE as _ILLEGAL_CHARACTERS_RE
+from openpyxl.drawing.spreadsheet_drawing import SpreadsheetDrawing as _SpreadsheetDrawing
+from openpyxl.styles.builtins import styles as _builtin_styles
+from openpyxl.utils import get_column_letter as _get_column_letter
+from openpyxl.utils.datetime import to_excel as _to_excel
+from openpyxl.utils.exceptions import IllegalCharacterError as _IllegalCharacterError
+from openpyxl.worksheet._writer import WorksheetWriter as _WorksheetWriter
+from openpyxl.worksheet.dimensions import SheetDimension as _SheetDimension
+from openpyxl.worksheet.hyperlink import Hyperlink as _Hyperlink
+from openpyxl.writer.excel import ExcelWriter as _ExcelWriter
+from openpyxl.xml.constants import REL_NS as _REL_NS, SHEET_MAIN_NS as _SHEET_MAIN_NS
+from openpyxl.xml.functions import tostring as _tostring
+
+from . import streaming as _streaming
+
+__all__ = []
+
+# Rows rendered at a time.
+CHUNK_SIZE = 10000
+# Bytes copied at a time from spooled sheetData.
+COPY_SIZE = 1 << 20
+
+_NUMBER = '<c r="%s" s="%d" t="n"><v>%.16g</v></c>'
+
+
+def write(xf, file, sheet_name='Sheet1', **kwargs):
+    """
+    Export XlFrame to a new workbook without going through openpyxl cells.
+    See write_workbook.
+
+    :param xf: XlFrame to export.
+    :type xf: xlframe.XlFrame
+    :param file: Path or binary file object to write to.
+    :param sheet_name: Sheet name.
+    :type sheet_name: str
+    :param kwargs: Passed to prepare_sheet.
+    :return: None
+    """
+    write_workbook(file, [(sheet_name, xf, kwargs)])
+
+
+def write_workbook(file, sheets):
+    """
+    Export XlFrames to a new workbook, one per sheet.
+
+    Sheet XML is generated straight from the dataframe columns and style codes, and streamed into the archive.
+    openpyxl still handles everything else in the package from an otherwise empty workbook
+    (styles, tables, relationships), so output matches an openpyxl export.
+
+    :param file: Path or binary file object to write to.
+    :param sheets: (sheet name, XlFrame, prepare_sheet kwargs) for each sheet.
+    :type sheets: list of tuple
+    :return: None
+    """
+    book = _Workbook()
+    book.remove(book.active)
+
+    parts = dict()
+    for sheet_name, xf, kwargs in sheets:
+        sheet = book.create_sheet(sheet_name)
+        parts[sheet.title] = prepare_sheet(xf, book, sheet, **kwargs)
+
+    archive = _ZipFile(file, 'w', _ZIP_DEFLATED, allowZip64=True)
+    PackageWriter(book, archive, parts).save()
+
+
+def write_chunks(frames, file, sheet_name='Sheet1', *, protect_sheet=False, right_to_left=False,
+                 columns_to_hide=None, add_filters=False, auto_fit=None, index=True, header=True, startcol=0,
+                 startrow=0, index_label=None, na_rep='', float_format=None, inf_rep='inf', freeze_panes=None):
+    """
+    Export XlFrames one after another to a single sheet of a new workbook, holding one frame at a time.
+
+    Each frame's rows are rendered as it arrives and spooled to a temporary file.
+    Column widths come before the rows in the sheet XML, so the package is only written once every frame is done.
+    Header row, column widths, conditional formats and sheet settings are taken from the first frame.
+    With auto_fit each column's width is the widest fit over all frames.
+
+    :param frames: XlFrames with the same columns, in row order.
+    :type frames: iterable of xlframe.XlFrame
+    :param file: Path or binary file object to write to.
+    :param sheet_name: Sheet name.
+    :type sheet_name: str
+    :return: None
+    """
+    book = _Workbook()
+    book.remove(book.active)
+    sheet = book.create_sheet(sheet_name)
+
+    fitted = auto_fit is not None and auto_fit is not False
+
+    head = widths = index_width = None
+    links = []
+    last_col = startcol
+    row = startrow
+    with _TemporaryFile() as spool:
+        for xf in frames:
+            if index_label is None:
+                index_label = xf.index.name
+            first = head is None
+            xf._fit_for_export(auto_fit, index=index, include_header=first and bool(header))
+            if first:
+                head = xf.iloc[:0, :]
+                widths = xf.column_widths.values.copy()
+                index_width = xf.index_width
+            elif fitted:
+                widths = _np.maximum(widths, xf.column_widths.values)
+                index_width = max(index_width, xf.index_width)
+
+            data = sheet_data(
+                xf, book, xf._export_style_names(book), index=index, header=first and header, startcol=startcol,
+                startrow=row, index_label=index_label, na_rep=na_rep, float_format=float_format, inf_rep=inf_rep
+            )
+            for chunk in data.chunks():
+                spool.write(chunk)
+            links.extend(data.hyperlinks)
+            row += len(data.heights)
+            last_col = startcol + len(data.values)
+
+        if head is None:
+            raise ValueError('No frames to export.')
+
+        head._column_widths[:] = widths
+        head._index_width = index_width
+        _streaming.prepare_sheet(
+            head, book, sheet, protect_sheet=protect_sheet, right_to_left=right_to_left,
+            columns_to_hide=columns_to_hide, add_filters=add_filters, index=index, header=header,
+            startcol=startcol, startrow=startrow, index_label=index_label, freeze_panes=freeze_panes
+        )
+
+        dimension = 'A1:A1'
+        if row > startrow and last_col > startcol:
+            dimension = '{}{}:{}{}'.format(
+                _get_column_letter(startcol + 1), startrow + 1, _get_column_letter(last_col), row
+            )
+            for table in sheet._tables:
+                # Table was sized to the empty head frame.
+                table.ref = table.autoFilter.ref = '{}{}:{}{}'.format(
+                    _get_column_letter(startcol + 1), startrow + 1, _get_column_letter(last_col),
+                    max(row, startrow + 2)
+                )
+            # Conditional formats cover the rows of every frame.
+            datarow = startrow + 1 if header else startrow
+            head._add_conditional_formats(
+                sheet, startcol=startcol + 1 if index else startcol, startrow=datarow, rows=row - datarow
+            )
+
+        spool.seek(0)
+        archive = _ZipFile(file, 'w', _ZIP_DEFLATED, allowZip64=True)
+        PackageWriter(book, archive, {sheet.title: SpooledSheet(dimension, spool, links)}).save()
+
+
+def prepare_sheet(xf, book, sheet, *, protect_sheet=False, right_to_left=False, columns_to_hide=None,
+                  add_filters=False, auto_fit=None, index=True, header=True, startcol=0, startrow=0,
+                  index_label=None, na_rep='', float_format=None, inf_rep='inf', freeze_panes=None, style_names=None):
+    """
+    Set sheet up for export and work out the contents of each cell.
+
+    Styles are added to book's cellXfs table here, so each cell only needs the index of its style.
+
+    :param xf: XlFrame to export.
+    :type xf: xlframe.XlFrame
+    :param book: Workbook being exported to.
+    :type book: openpyxl.Workbook
+    :param sheet: Empty sheet to export to.
+    :param style_names: Names xf's styles were already added to book under, indexed by style code.
+        Styles are added to book if unspecified.
+    :type style_names: list
+    :return: SheetData
+    """
+    if index_label is None:
+        index_label = xf.index.name
+
+    if style_names is None:
+        style_names = xf._export_style_names(book)
+
+    xf._fit_for_export(auto_fit, index=index, include_header=bool(header))
+
+    _streaming.prepare_sheet(
+        xf, book, sheet, protect_sheet=protect_sheet, right_to_left=right_to_left, columns_to_hide=columns_to_hide,
+        add_filters=add_filters, index=index, header=header, startcol=startcol, startrow=startrow,
+        index_label=index_label, freeze_panes=freeze_panes
+    )
+
+    return sheet_data(
+        xf, book, style_names, index=index, header=header, startcol=startcol, startrow=startrow,
+        index_label=index_label, na_rep=na_rep, float_format=float_format, inf_rep=inf_rep
+    )
+
+
+def sheet_data(xf, book, style_names, *, index=True, header=True, startcol=0, startrow=0, index_label=None,
+               na_rep='', float_format=None, inf_rep='inf'):
+    """
+    Work out the contents of each exported cell and add the styles used to book's cellXfs table.
+
+    :param xf: XlFrame being exported.
+    :type xf: xlframe.XlFrame
+    :param book: Workbook being exported to.
+    :type book: openpyxl.Workbook
+    :param style_names: Names xf's styles were added to book under, indexed by style code.
+    :type style_names: list
+    :return: SheetData
+    """
+    values, styles, links = _streaming.body_columns(
+        xf, index=index, index_label=index_label, na_rep=na_rep, float_format=float_format, inf_rep=inf_rep
+    )
+    values = [column.tolist() for column in values]
+    heights = xf.row_heights.values.tolist()
+
+    datarow = startrow + 1 if header else startrow
+    sources = ([xf.index] if index else []) + [xf.dataframe.iloc[:, i] for i in range(len(xf.columns))]
+    nulls = [None if column is None else _np.asarray(source.isnull()) for source, column in zip(sources, links)]
+    links = hyperlinks(values, links, datarow + 1, startcol + 1, nulls=nulls)
+
+    if header:
+        header_values, header_styles = _streaming.header_cells(xf, index=index, index_label=index_label)
+        values = [[value] + column for value, column in zip(header_values, values)]
+        styles = [_np.concatenate(([code], column)) for code, column in zip(header_styles, styles)]
+        heights.insert(0, xf.header_height)
+
+    # cellXfs index by style code
+    xf_ids = _np.zeros(len(style_names), dtype=int)
+    if styles:
+        for code in _np.unique(_np.concatenate(styles)):
+            style = style_names[code]
+            array = named_style(book, style).as_tuple() if isinstance(style, str) else style
+            xf_ids[code] = book._cell_styles.add(_copy(array))
+
+    data = SheetData(
+        values, [xf_ids[column].tolist() for column in styles], heights, first_row=startrow + 1,
+        first_col=startcol + 1, hyperlinks=links
+    )
+    return data
+
+
+def named_style(book, name):
+    """
+    Get named style from book. Builtin styles are added to book on first use, same as assigning cell.style.
+
+    :param book: Workbook.
+    :type book: openpyxl.Workbook
+    :param name: Style name.
+    :type name: str
+    :return: openpyxl.styles.NamedStyle
+    """
+    if name not in book._named_styles.names and name in _builtin_styles:
+        book.add_named_style(_builtin_styles[name])
+    return book._named_styles[name]
+
+
+def hyperlinks(values, links, first_row, first_col, nulls=None):
+    """
+    Create hyperlinks for exported cells. Empty cells take the link target as their value, same as openpyxl.
+    Missing values count as empty whatever na_rep they were given.
+
+    :param values: Cell values for each column. Updated in place.
+    :type values: list of lists
+    :param links: Hyperlinks for each column. None for columns without any.
+    :type links: list
+    :param first_row: Row number of first row. 1 indexed.
+    :param first_col: Column number of first column. 1 indexed.
+    :param nulls: Missing value mask for each column with links. Values that are None count as missing if unspecified.
+    :type nulls: list of numpy.ndarray
+    :return: list of openpyxl.worksheet.hyperlink.Hyperlink
+    """
+    result = []
+    for col_index, column in enumerate(links):
+        if column is None:
+            continue
+        letter = _get_column_letter(first_col + col_index)
+        for row_index, link in enumerate(column):
+            if link is None or (isinstance(link, float) and _np.isnan(link)):
+                continue
+            if isinstance(link, _Hyperlink):
+                link = _copy(link)
+            else:
+                link = _Hyperlink(ref='', target=link)
+            link.ref = '{}{}'.format(letter, first_row + row_index)
+            if values[col_index][row_index] is None or (nulls is not None and nulls[col_index][row_index]):
+                values[col_index][row_index] = link.target
+            result.append(link)
+    return result
+
+
+class SheetData:
+
+    def __init__(self, values, styles, heights, first_row=1, first_col=1, hyperlinks=()):
+        """
+        Everything needed to render a sheet's cells. Plain lists so can be pickled.
+
+        :param values: Cell values for each column.
+        :type values: list of lists
+        :param styles: cellXfs index for each cell, for each column.
+        :type styles: list of lists
+        :param heights: Height for each row.
+        :type heights: list
+        :param first_row: Row number of first row. 1 indexed.
+        :type first_row: int
+        :param first_col: Column number of first column. 1 indexed.
+        :type first_col: int
+        :param hyperlinks: Hyperlinks of the cells.
+        :type hyperlinks: list of openpyxl.worksheet.hyperlink.Hyperlink
+        """
+        self.values = values
+        self.styles = styles
+        self.heights = heights
+        self.first_row = first_row
+        self.first_col = first_col
+        self.hyperlinks = hyperlinks
+
+    @property
+    def dimension(self):
+        if not self.heights or not self.values:
+            return 'A1:A1'
+        return '{}{}:{}{}'.format(
+            _get_column_letter(self.first_col), self.first_row,
+            _get_column_letter(self.first_col + len(self.values) - 1), self.first_row + len(self.heights) - 1
+        )
+
+    def rows(self, chunk_size=CHUNK_SIZE):
+        """
+        Render sheetData contents.
+
+        :param chunk_size: Rows rendered at a time.
+        :type chunk_size: int
+        :return: XML for chunk_size rows at a time.
+        :rtype: iterator of str
+        """
+        letters = [_get_column_letter(self.first_col + i) for i in range(len(self.values))]
+        for start in range(0, len(self.heights), chunk_size):
+            stop = min(start + chunk_size, len(self.heights))
+            row_numbers = range(self.first_row + start, self.first_row + stop)
+            columns = [
+                _render_column(letter, row_numbers, column[start:stop], styles[start:stop])
+                for letter, column, styles in zip(letters, self.values, self.styles)
+            ]
+            cells = zip(*columns) if columns else ((),) * (stop - start)
+            yield ''.join(
+                _row(row_number, height, row_cells)
+                for row_number, height, row_cells in zip(row_numbers, self.heights[start:stop], cells)
+            )
+
+    def chunks(self):
+        """
+        :return: Encoded sheetData contents.
+        :rtype: iterator of bytes
+        """
+        for chunk in self.rows():
+            yield chunk.encode('utf-8')
+
+
+class RenderedSheet:
+
+    def __init__(self, dimension, xml, hyperlinks=()):
+        """
+        Sheet contents already rendered by render. Stands in for SheetData when writing the package.
+
+        :param dimension: Range covered by the sheet's cells.
+        :type dimension: str
+        :param xml: Encoded sheetData contents, or a future that will give them.
+        :type xml: bytes or concurrent.futures.Future
+        :param hyperlinks: Hyperlinks of the cells.
+        :type hyperlinks: list of openpyxl.worksheet.hyperlink.Hyperlink
+        """
+        self.dimension = dimension
+        self.xml = xml
+        self.hyperlinks = hyperlinks
+
+    def chunks(self):
+        yield self.xml.result() if hasattr(self.xml, 'result') else self.xml
+
+
+class SpooledSheet:
+
+    def __init__(self, dimension, file, hyperlinks=()):
+        """
+        Sheet contents already rendered to a file. Stands in for SheetData when writing the package.
+
+        :param dimension: Range covered by the sheet's cells.
+        :type dimension: str
+        :param file: Binary file object positioned at the start of the sheetData contents.
+        :param hyperlinks: Hyperlinks of the cells.
+        :type hyperlinks: list of openpyxl.worksheet.hyperlink.Hyperlink
+        """
+        self.dimension = dimension
+        self.file = file
+        self.hyperlinks = hyperlinks
+
+    def chunks(self):
+        return iter(lambda: self.file.read(COPY_SIZE), b'')
+
+
+def render(data):
+    """
+    Render all of a sheet's sheetData contents. Module level so can be run in a process pool.
+
+    :param data: Sheet contents.
+    :type data: SheetData
+    :return: Encoded XML.
+    :rtype: bytes
+    """
+    return b''.join(data.chunks())
+
+
+class SheetWriter(_WorksheetWriter):
+
+    def __init__(self, ws, out, data):
+        """
+        openpyxl worksheet writer that writes sheetData from SheetData instead of the sheet's cells.
+
+        :param ws: Sheet being written.
+        :param out: Binary file object to write to.
+        :param data: Sheet contents.
+        :type data: SheetData, RenderedSheet or SpooledSheet
+        """
+        self.data = data
+        super().__init__(ws, out=out)
+        # openpyxl clears the sheet's hyperlinks to collect them from its cells.
+        ws._hyperlinks = list(data.hyperlinks)
+
+    def get_stream(self):
+        self.out.write('<worksheet xmlns="{}" xmlns:r="{}">'.format(_SHEET_MAIN_NS, _REL_NS).encode('utf-8'))
+        try:
+            while True:
+                el = (yield)
+                if el is not None:
+                    self.out.write(_tostring(el))
+        except GeneratorExit:
+            if not self.out.closed:
+                self.out.write(b'</worksheet>')
+
+    def write_dimensions(self):
+        self.xf.send(_SheetDimension(self.data.dimension).to_tree())
+
+    def write_rows(self):
+        self.out.write(b'<sheetData>')
+        for chunk in self.data.chunks():
+            self.out.write(chunk)
+        self.out.write(b'</sheetData>')
+
+
+class PackageWriter(_ExcelWriter):
+
+    def __init__(self, workbook, archive, sheets):
+        """
+        openpyxl package writer that writes worksheets with SheetWriter straight into the archive.
+
+        :param workbook: Workbook to write.
+        :param archive: Archive to write to.
+        :type archive: zipfile.ZipFile
+        :param sheets: SheetData, RenderedSheet or SpooledSheet by sheet title.
+        :type sheets: dict
+        """
+        super().__init__(workbook, archive)
+        self.sheets = sheets
+
+    def write_worksheet(self, ws):
+        ws._drawing = _SpreadsheetDrawing()
+        ws._drawing.charts = ws._charts
+        ws._drawing.images = ws._images
+        with self._archive.open(ws.path[1:], 'w', force_zip64=True) as out:
+            writer = SheetWriter(ws, out, self.sheets[ws.title])
+            writer.write()
+        ws._rels = writer._rels
+        self.manifest.append(ws)
+
+
+def _row(row_number, height, cells):
+    if height is None or height != height:
+        return '<row r="%d">%s</row>' % (row_number, ''.join(cells))
+    return '<row r="%d" ht="%.16g" customHeight="1">%s</row>' % (row_number, height, ''.join(cells))
+
+
+def _render_column(letter, row_numbers, values, styles):
+    refs = ['%s%d' % (letter, row_number) for row_number in row_numbers]
+    if {type(value) for value in values} <= {int, float}:
+        return [_NUMBER % cell for cell in zip(refs, styles, values)]
+    return [_cell(ref, style, value) for ref, style, value in zip(refs, styles, values)]
+
+
+def _cell(ref, style, value):
+    """
+    Render a cell the same as openpyxl would for the value pandas gives it.
+    """
+    kind = type(value)
+    if kind is int or kind is float:
+        return _NUMBER % (ref, style, value)
+    if value is None:
+        return '<c r="%s" s="%d" t="n"/>' % (ref, style)
+    if kind is str:
+        return _string(ref, style, value)
+    if kind is bool:
+        return '<c r="%s" s="%d" t="b"><v>%d</v></c>' % (ref, style, value)
+    if isinstance(value, (_datetime, _date)):
+        return _NUMBER % (ref, style, _to_excel(value))
+    return _cell(ref, style, _streaming.excel_value(value))
+
+
+def _string(ref, style, value):
+    value = value[:32767]
+    if _ILLEGAL_CHARACTERS_RE.search(value):
+        raise _IllegalCharacterError
+    if len(value) > 1 and value.startswith('='):
+        return '<c r="%s" s="%d"><f>%s</f><v/></c>' % (ref, style, _escape(value[1:]))
+    if value in _ERROR_CODES:
+        return '<c r="%s" s="%d" t="e"><v>%s</v></c>' % (ref, style, _escape(value))
+    if not value:
+        return '<c r="%s" s="%d" t="inlineStr"/>' % (ref, style)
+    space = ' xml:space="preserve"' if value != value.strip() else ''
+    return '<c r="%s" s="%d" t="inlineStr"><is><t%s>%s</t></is></c>' % (ref, style, space, _escape(value))
+
+
+if __name__ == '__main__':
+    pass
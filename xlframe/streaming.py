@@ -0,0 +1,274 @@
+from copy import copy as _copy
+from datetime import date as _date, datetime as _datetime, timedelta as _timedelta
+
+import numpy as _np
+import pandas as _pd
+from openpyxl.cell import WriteOnlyCell as _WriteOnlyCell
+from openpyxl.utils import get_column_letter as _get_column_letter
+from openpyxl.worksheet.filters import AutoFilter as _AutoFilter
+from openpyxl.worksheet.hyperlink import Hyperlink as _Hyperlink
+from openpyxl.worksheet.table import TableColumn as _TableColumn
+from pandas.api.types import is_bool as _is_bool, is_float as _is_float, is_integer as _is_integer
+
+from .registry import apply_style as _apply_style
+
+__all__ = []
+
+
+def write_sheet(xf, book, sheet_name, *, protect_sheet=False, right_to_left=False, columns_to_hide=None,
+                add_filters=False, auto_fit=None, index=True, header=True, startcol=0, startrow=0,
+                index_label=None, na_rep='', float_format=None, inf_rep='inf', freeze_panes=None):
+    """
+    Export XlFrame to a new sheet of a write only workbook.
+    Values and styles are written together, one row at a time.
+
+    Everything that affects the sheet outside of the cells (dimensions, tables, filters, protection)
+    has to be set before the first row is written so is all worked out up front.
+
+    :param xf: XlFrame to export.
+    :type xf: xlframe.XlFrame
+    :param book: Write only workbook.
+    :type book: openpyxl.Workbook
+    :param sheet_name: Name for new sheet.
+    :type sheet_name: str
+    :return: Write only worksheet.
+    """
+    if sheet_name in book:
+        raise ValueError('Sheet "{}" already exists. Write only sheets cannot be edited.'.format(sheet_name))
+    if index_label is None:
+        index_label = xf.index.name
+
+    sheet = book.create_sheet(sheet_name)
+
+    style_names = xf._export_style_names(book)
+
+    xf._fit_for_export(auto_fit, index=index, include_header=bool(header))
+
+    prepare_sheet(
+        xf, book, sheet, protect_sheet=protect_sheet, right_to_left=right_to_left, columns_to_hide=columns_to_hide,
+        add_filters=add_filters, index=index, header=header, startcol=startcol, startrow=startrow,
+        index_label=index_label, freeze_panes=freeze_panes
+    )
+
+    templates = dict()
+
+    def style_array(code):
+        # Style each distinct style once then share its style array between cells.
+        try:
+            return templates[code]
+        except KeyError:
+            cell = _WriteOnlyCell(sheet)
+            _apply_style(cell, style_names[code])
+            templates[code] = cell._style
+            return cell._style
+
+    lead = [None] * startcol
+    for _ in range(startrow):
+        sheet.append(lead)
+
+    if header:
+        row = list(lead)
+        for value, style in zip(*header_cells(xf, index=index, index_label=index_label)):
+            row.append(_cell(sheet, value, style_array(style)))
+        _append(sheet, row, startrow + 1, xf.header_height)
+
+    datarow = startrow + 1 if header else startrow
+    values, styles, links = body_columns(
+        xf, index=index, index_label=index_label, na_rep=na_rep, float_format=float_format, inf_rep=inf_rep
+    )
+
+    heights = xf.row_heights.values
+    for row_index, row in enumerate(zip(*values)):
+        cells = list(lead)
+        for col_index, value in enumerate(row):
+            cell = _cell(sheet, value, style_array(styles[col_index][row_index]))
+            if links[col_index] is not None:
+                _link(cell, links[col_index][row_index])
+            cells.append(cell)
+        _append(sheet, cells, datarow + row_index + 1, heights[row_index])
+
+    return sheet
+
+
+def prepare_sheet(xf, book, sheet, *, protect_sheet=False, right_to_left=False, columns_to_hide=None,
+                  add_filters=False, index=True, header=True, startcol=0, startrow=0, index_label=None,
+                  freeze_panes=None):
+    """
+    Set up everything on sheet outside of the cells for an export that writes its own cells.
+    Column dimensions, tables, filters, conditional formats, views and protection.
+
+    :param xf: XlFrame being exported.
+    :type xf: xlframe.XlFrame
+    :param book: Workbook sheet belongs to.
+    :type book: openpyxl.Workbook
+    :param sheet: Sheet being exported to.
+    :return: None
+    """
+    sheet.sheet_view.rightToLeft = right_to_left
+
+    datacol = startcol + 1 if index else startcol
+
+    # column dimensions
+    if index:
+        sheet.column_dimensions[_get_column_letter(startcol + 1)].width = xf.index_width
+    for col_index, width in enumerate(xf.column_widths.values):
+        sheet.column_dimensions[_get_column_letter(datacol + col_index + 1)].width = width
+
+    if columns_to_hide:
+        if isinstance(columns_to_hide, (str, int)):
+            columns_to_hide = [columns_to_hide]
+        for column in columns_to_hide:
+            sheet.column_dimensions[xf.get_column_letter(column, startcol=datacol)].hidden = True
+
+    if xf._table_args:
+        table = xf._table(book, startcol=datacol, startrow=startrow, index=index)
+        headers, _ = header_cells(xf, index=index, index_label=index_label)
+        # Cells can't be read back to find the header names.
+        table.tableColumns = [_TableColumn(id=i, name=str(name)) for i, name in enumerate(headers, 1)]
+        table.autoFilter = _AutoFilter(ref=table.ref)
+        sheet.add_table(table)
+    elif add_filters:
+        sheet.auto_filter.ref = xf._get_range_as_str(row_index=0, startcol=datacol, startrow=startrow, index=index)
+
+    xf._add_conditional_formats(sheet, startcol=datacol, startrow=startrow + 1 if header else startrow)
+
+    if freeze_panes is not None:
+        sheet.freeze_panes = '{}{}'.format(_get_column_letter(freeze_panes[1] + 1), freeze_panes[0] + 1)
+
+    if protect_sheet:
+        sheet.protection.autoFilter = False
+        sheet.protection.enable()
+
+
+def header_cells(xf, index=True, index_label=None):
+    """
+    Header row values and style codes in the order they are exported.
+
+    :param xf: XlFrame being exported.
+    :type xf: xlframe.XlFrame
+    :param index: Index is exported.
+    :type index: bool
+    :param index_label: Header for index column.
+    :return: (values, style codes)
+    :rtype: tuple of lists
+    """
+    values = list(xf.columns)
+    styles = list(xf._header_styles.values)
+    if index:
+        label = index_label
+        if not label and xf._table_args:
+            label = 'index'  # Otherwise formatting as table will auto give it a ColumnX name.
+        values.insert(0, label or None)
+        styles.insert(0, xf._header_styles.iat[0])
+    return values, styles
+
+
+def body_columns(xf, index=True, index_label=None, na_rep='', float_format=None, inf_rep='inf'):
+    """
+    Cell values, style codes and hyperlinks for each exported column, index first.
+
+    :param xf: XlFrame being exported.
+    :type xf: xlframe.XlFrame
+    :param index: Index is exported.
+    :type index: bool
+    :param index_label: Header for index column.
+    :return: (values, style codes, hyperlinks). Lists of numpy arrays. Hyperlinks None for columns without any.
+    :rtype: tuple of lists
+    """
+    columns = []
+    if index:
+        columns.append(xf.index.to_series())
+    columns.extend(xf.dataframe[col] for col in xf.columns)
+    values = [column_values(column, na_rep, float_format, inf_rep) for column in columns]
+
+    styles = [xf._styleframe[col].values for col in xf.columns]
+    if index:
+        styles.insert(0, xf._index_styles.values)
+
+    links = [None] * len(columns)
+    if xf._hyperlinks is not None:
+        for col_name, column in xf._hyperlinks.iteritems():
+            if col_name in xf.columns:
+                links[xf.columns.get_loc(col_name) + index] = column.values
+            elif index and col_name in (index_label, xf.index.name, 'index'):
+                links[0] = column.values
+    return values, styles, links
+
+
+def _append(sheet, row, row_number, height):
+    """
+    Append row with height. Row dimension only needs to exist until the row is written.
+    """
+    dimension = sheet.row_dimensions[row_number]
+    dimension.height = height
+    sheet.append(row)
+    del sheet.row_dimensions[row_number]
+
+
+def _cell(sheet, value, style_array):
+    cell = _WriteOnlyCell(sheet, value)
+    cell._style = style_array
+    return cell
+
+
+def _link(cell, hyperlink):
+    if hyperlink is None or (isinstance(hyperlink, float) and _np.isnan(hyperlink)):
+        return
+    if isinstance(hyperlink, _Hyperlink):
+        #  make sure each cell has a unique Hyperlink obj to receive the ref of that cell
+        hyperlink = _copy(hyperlink)
+    cell.hyperlink = hyperlink
+
+
+def column_values(column, na_rep='', float_format=None, inf_rep='inf'):
+    """
+    Convert column to values openpyxl can write. Same conversions pandas makes when writing cells.
+
+    :param column: Column to convert.
+    :type column: pandas.Series
+    :param na_rep: Missing data representation.
+    :param float_format: Format string for floats.
+    :param inf_rep: Infinity representation.
+    :return: numpy object array
+    """
+    nulls = column.isnull().values
+    if column.dtype.kind == 'f':
+        data = column.values
+        infs = _np.isinf(data)
+        if float_format is not None:
+            values = _np.array([float(float_format % v) for v in data], dtype=object)
+        else:
+            values = data.astype(object)
+        if infs.any():
+            values[infs] = _np.where(data[infs] > 0, inf_rep, '-' + inf_rep)
+    elif column.dtype.kind == 'M':
+        values = _pd.Series(column.dt.to_pydatetime(), dtype=object).values
+    elif column.dtype.kind == 'm':
+        values = (column.dt.total_seconds().values / 86400).astype(object)
+    else:
+        values = column.astype(object).values.copy()
+
+    if nulls.any():
+        values[nulls] = na_rep
+    return values
+
+
+def excel_value(value):
+    """
+    Same conversion pandas makes before handing a value to the excel engine.
+    """
+    if _is_integer(value):
+        return int(value)
+    if _is_float(value):
+        return float(value)
+    if _is_bool(value):
+        return bool(value)
+    if isinstance(value, (_datetime, _date)):
+        return value
+    if isinstance(value, _timedelta):
+        return value.total_seconds() / 86400
+    return str(value)
+
+
+if __name__ == '__main__':
+    pass
@@ -1,5 +1,6 @@
-from copy import copy as _copy
+from functools import lru_cache as _lru_cache
 
+from openpyxl.descriptors.serialisable import Serialisable as _Serialisable
 from openpyxl.styles import NamedStyle, PatternFill, Protection, Border, Font, Side, Color, Alignment
 from openpyxl.styles.builtins import styles as _styles
 from openpyxl.styles.colors import aRGB_REGEX as _aRGB_REGEX, COLOR_INDEX as _COLOR_INDEX
@@ -11,28 +12,20 @@ __all__ = ['Style']
 _theme_builtins = [
     'FFFFFF', '000000', 'EEECE1', '1F497D', '4F81BD', 'C0504D', '9BBB59', '8064A2', '4BACC6', 'F79646'
 ]
+# Distinct colors and style parts cached. Cached objects are never handed out, only copies of them. See _clone.
+CACHE_SIZE = 1024
 
 
 def _color_parser(color):
     if color is None:
         return
     elif isinstance(color, Color):
-        return _copy(color)
+        return _clone(_color(*_color_key(color)))
     elif isinstance(color, tuple):
         color = _rgb_to_hex(color)
 
     if isinstance(color, str):
-        try:
-            color = getattr(_utils.Colors, color.lower())
-        except AttributeError:
-            pass
-
-        if color.startswith('#'):
-            color = color[1:]
-        if _aRGB_REGEX.match(color):
-            return Color(
-                rgb=color
-            )
+        return _clone(_parse_color(color))
 
     raise ValueError(
         'Invalid color {}.\n\nMust be (r, g, b) tuple, hex string, '
@@ -40,6 +33,111 @@ def _color_parser(color):
     )
 
 
+@_lru_cache(maxsize=CACHE_SIZE)
+def _parse_color(color):
+    try:
+        color = getattr(_utils.Colors, color.lower())
+    except AttributeError:
+        pass
+
+    if color.startswith('#'):
+        color = color[1:]
+    if _aRGB_REGEX.match(color):
+        return _color('rgb', color, 0.0)
+
+    raise ValueError(
+        'Invalid color {}.\n\nMust be (r, g, b) tuple, hex string, '
+        'utils.Colors name or openpyxl Color.'.format(str(color))
+    )
+
+
+def _clone(obj):
+    """
+    Copy of a cached openpyxl style object, so changes to it don't reach the cache or other styles.
+    Copies its attributes as they are instead of validating them again through the constructor.
+
+    :param obj: openpyxl Color, Font, PatternFill, Alignment, Side, Border or Protection.
+    :return: Copy of obj.
+    """
+    clone = object.__new__(type(obj))
+    attributes = clone.__dict__
+    attributes.update(obj.__dict__)
+    for key, value in attributes.items():
+        if isinstance(value, _Serialisable):
+            attributes[key] = _clone(value)
+    return clone
+
+
+def _color_key(color):
+    # Hashable value of color. Cheaper than hashing the Color.
+    return None if color is None else (color.type, color.value, color.tint)
+
+
+@_lru_cache(maxsize=CACHE_SIZE)
+def _color(color_type, value, tint):
+    return Color(tint=tint, **{color_type: value})
+
+
+@_lru_cache(maxsize=CACHE_SIZE)
+def _font(name, size, color, bold, underline, strikethrough, italic):
+    return Font(
+        name=name,
+        size=size,
+        color=None if color is None else _color(*color),
+        bold=bold,
+        underline=underline,
+        strikethrough=strikethrough,
+        italic=italic
+    )
+
+
+@_lru_cache(maxsize=CACHE_SIZE)
+def _fill(pattern, color):
+    if color:
+        return PatternFill(
+            fill_type=pattern,
+            fgColor=_color(*color),
+            bgColor=Color()
+        )
+    return PatternFill()
+
+
+@_lru_cache(maxsize=CACHE_SIZE)
+def _alignment(horizontal, vertical, wrap_text, shrink_to_fit, indent):
+    return Alignment(
+        horizontal=horizontal,
+        vertical=vertical,
+        wrap_text=wrap_text,
+        shrink_to_fit=shrink_to_fit,
+        indent=indent
+    )
+
+
+@_lru_cache(maxsize=CACHE_SIZE)
+def _side(border_style, color):
+    if border_style:
+        return Side(
+            border_style=border_style,
+            color=None if color is None else _color(*color)
+        )
+    return Side()
+
+
+@_lru_cache(maxsize=CACHE_SIZE)
+def _border(sides):
+    return Border(
+        *(_side(*side) for side in sides)
+    )
+
+
+@_lru_cache(maxsize=CACHE_SIZE)
+def _protection(locked, hidden):
+    return Protection(
+        locked=locked,
+        hidden=hidden
+    )
+
+
 def _get_theme_colors(book):
     # https://groups.google.com/forum/#!msg/openpyxl-users/v2FDsbDDTqU/rQWLAXZFkeUJ
     xlmns = 'http://schemas.openxmlformats.org/drawingml/2006/main'
@@ -213,12 +311,11 @@ class Style:
 
     @property
     def sides(self):
-        return tuple(
-            Side(
-                border_style=e[0],
-                color=e[1]
-            ) if e[0] else Side() for e in self._sides
-        )
+        return tuple(_clone(_side(*side)) for side in self._side_keys)
+
+    @property
+    def _side_keys(self):
+        return tuple((e[0], _color_key(e[1])) for e in self._sides)
 
     @property
     def _sides(self):
@@ -248,15 +345,10 @@ class Style:
 
     @property
     def font(self):
-        return Font(
-            name=self.font_style,
-            size=self.font_size,
-            color=self.font_color,
-            bold=self.bold,
-            underline=self.underline,
-            strikethrough=self.strikethrough,
-            italic=self.italic
-        )
+        return _clone(_font(
+            self.font_style, self.font_size, _color_key(self.font_color), self.bold, self.underline,
+            self.strikethrough, self.italic
+        ))
 
     @font.setter
     def font(self, font):
@@ -270,13 +362,7 @@ class Style:
 
     @property
     def fill(self):
-        if self.fill_color:
-            return PatternFill(
-                fill_type=self.fill_pattern,
-                fgColor=self.fill_color,
-                bgColor=Color()
-            )
-        return PatternFill()
+        return _clone(_fill(self.fill_pattern, _color_key(self.fill_color)))
 
     @fill.setter
     def fill(self, pattern_fill):
@@ -285,13 +371,9 @@ class Style:
 
     @property
     def alignment(self):
-        return Alignment(
-            horizontal=self.horizontal_alignment,
-            vertical=self.vertical_alignment,
-            wrap_text=self.wrap_text,
-            shrink_to_fit=self.shrink_to_fit,
-            indent=self.indent
-        )
+        return _clone(_alignment(
+            self.horizontal_alignment, self.vertical_alignment, self.wrap_text, self.shrink_to_fit, self.indent
+        ))
 
     @alignment.setter
     def alignment(self, alignment):
@@ -303,9 +385,7 @@ class Style:
 
     @property
     def border(self):
-        return Border(
-            *self.sides
-        )
+        return _clone(_border(self._side_keys))
 
     @border.setter
     def border(self, border):
@@ -316,10 +396,7 @@ class Style:
 
     @property
     def protection(self):
-        return Protection(
-            locked=self.locked,
-            hidden=self.hidden
-        )
+        return _clone(_protection(self.locked, self.hidden))
 
     @protection.setter
     def protection(self, protection):
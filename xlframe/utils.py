@@ -226,6 +226,14 @@ class Options:
     default_autofit_flat = 1.5
     default_autofit_min = 6.86
     default_autofit_max = 150
+    # Measure auto_fit widths from font glyph widths instead of counting characters.
+    default_autofit_font_metrics = False
+    default_autofit_font_scalar = 1.1
+    # Excel's largest row height.
+    default_autofit_row_max = 409
+
+    # Export styles as unnamed cell formats when a frame uses more named styles than this. None for no limit.
+    max_named_styles = None
 
     default_column_width = 8.43
     default_row_height = 15
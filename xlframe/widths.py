@@ -0,0 +1,377 @@
+from collections import namedtuple as _namedtuple
+from concurrent.futures import Executor as _Executor, ProcessPoolExecutor as _ProcessPoolExecutor, \
+    ThreadPoolExecutor as _ThreadPoolExecutor
+
+import numpy as _np
+import pandas as _pd
+
+from . import metrics as _metrics
+from . import utils as _utils
+
+try:
+    from multiprocessing.shared_memory import SharedMemory as _SharedMemory
+except ImportError:  # python < 3.8
+    _SharedMemory = None
+
+__all__ = []
+
+# Powers of ten exact as float64.
+_POWERS = 10.0 ** _np.arange(23)
+# Magnitudes below this have exact integer parts and fractions, and str() without an exponent.
+_EXACT = 1e15
+# Distance from a rounding tie within which float arithmetic may round differently to formatting.
+_TIE_MARGIN = 1e-4
+
+# auto_fit options shared by every column. rows are the sampled positions or None,
+# unit the width of a digit in the default font and empty whether the frame has no rows.
+FitSettings = _namedtuple(
+    'FitSettings', 'scalar flat max_width min_width include_header font_metrics rows unit empty'
+)
+# Array copied to shared memory for a process pool.
+SharedArray = _namedtuple('SharedArray', 'name dtype shape')
+
+
+def digits(values):
+    """
+    Number of digits in the integer part of each value.
+
+    :param values: Non-negative whole numbers below 1e15.
+    :type values: numpy.ndarray
+    :return: numpy.ndarray of int
+    """
+    result = _np.ones(len(values), dtype=_np.int64)
+    big = values >= 1
+    result[big] = _np.floor(_np.log10(values[big])).astype(_np.int64) + 1
+    # log10 can be off by one next to powers of ten.
+    result += values >= _POWERS[result]
+    result -= (result > 1) & (values < _POWERS[result - 1])
+    return result
+
+
+def str_len(column):
+    """
+    Length of the longest value as a string. Same as column.apply(str).str.len().max().
+
+    :param column: Column to measure.
+    :type column: pandas.Series
+    :return: int
+    """
+    kind = column.dtype.kind
+    values = column.values
+    if kind in 'iu':
+        # Longest is the largest or the most negative.
+        return max(len(str(values.max())), len(str(values.min())))
+    if kind == 'b':
+        return _slow_max(values, str)
+    if kind == 'O' and _pd.api.types.infer_dtype(values, skipna=True) in ('string', 'empty'):
+        lengths = column.str.len()
+        missing = lengths.isna().values
+        longest = 0 if missing.all() else int(lengths.max())
+        if missing.any():
+            longest = max(longest, _slow_max(values[missing], str))
+        return longest
+    return column.apply(str).str.len().max()
+
+
+def rounded_str_len(column):
+    """
+    Length of the longest value rounded to a whole number as a string.
+    Same as column.round().apply(str).str.len().max().
+
+    :param column: Float column to measure.
+    :type column: pandas.Series
+    :return: int
+    """
+    rounded = _np.round(column.values.astype(_np.float64))
+    with _np.errstate(invalid='ignore'):
+        fast = _np.abs(rounded) < _EXACT
+    # digits + '.0' + sign
+    lengths = digits(_np.abs(rounded[fast])) + 2 + _np.signbit(rounded[fast])
+    longest = int(lengths.max()) if len(lengths) else 0
+    if not fast.all():
+        longest = max(longest, _slow_max(rounded[~fast], lambda value: str(float(value))))
+    return longest
+
+
+def fixed_str_len(column):
+    """
+    Length of the longest value formatted to 10 decimal places with thousands separators, trailing zeros removed.
+    Same as column.apply('{:,.10f}'.format).str.rstrip('0').str.len().max().
+
+    :param column: Float column to measure.
+    :type column: pandas.Series
+    :return: int
+    """
+    values = column.values.astype(_np.float64)
+    absolute = _np.abs(values)
+    with _np.errstate(invalid='ignore'):
+        fast = absolute < _EXACT
+
+    whole = _np.floor(absolute[fast])
+    scaled = (absolute[fast] - whole) * 1e10
+    decimals = _np.round(scaled)
+    near_tie = _np.abs(scaled - _np.floor(scaled) - 0.5) < _TIE_MARGIN
+    # Rounding up to the next whole number.
+    carry = decimals == 1e10
+    whole += carry
+    decimals[carry] = 0
+
+    decimals = decimals.astype(_np.int64)
+    places = _np.full(len(decimals), 10, dtype=_np.int64)
+    for trailing in range(1, 11):
+        places[decimals % 10 ** trailing == 0] = 10 - trailing
+
+    whole_digits = digits(whole)
+    # sign + digits + separators + '.' + decimal places
+    lengths = _np.signbit(values[fast]) + whole_digits + (whole_digits - 1) // 3 + 1 + places
+
+    slow = ~fast
+    slow[fast] = near_tie
+    longest = int(lengths[~near_tie].max()) if (~near_tie).any() else 0
+    if slow.any():
+        longest = max(longest, _slow_max(values[slow], lambda value: '{:,.10f}'.format(value).rstrip('0')))
+    return longest
+
+
+def float_str_len_bound(column, rounded=False):
+    """
+    Upper bound on rounded_str_len or fixed_str_len from the largest magnitude in column.
+
+    :param column: Float column to measure.
+    :type column: pandas.Series
+    :param rounded: Bound rounded_str_len instead of fixed_str_len.
+    :type rounded: bool
+    :return: int
+    """
+    values = column.values.astype(_np.float64)
+    finite = _np.isfinite(values)
+    largest = _np.abs(values[finite]).max() if finite.any() else 0.0
+    sign = int(_np.signbit(values).any())
+    if rounded:
+        # Bigger values switch to exponent notation, which is at most 24 characters.
+        bound = sign + (len(str(float(_np.round(largest)))) if largest < 1e16 else 24)
+    else:
+        # One more in case the decimals round up.
+        whole = len('{:.0f}'.format(_np.floor(largest) + 1))
+        bound = sign + whole + (whole - 1) // 3 + 1 + 10
+    if not finite.all():
+        bound = max(bound, 4)
+    return bound
+
+
+def sample_positions(length, size, random_state=None):
+    """
+    Random row positions to estimate widths from. Drawn with replacement so cost depends on size, not length.
+
+    :param length: Rows to pick from.
+    :type length: int
+    :param size: Rows to pick.
+    :type size: int
+    :param random_state: Seed for numpy.random.RandomState.
+    :return: numpy.ndarray
+    """
+    return _np.random.RandomState(random_state).randint(0, length, size)
+
+
+def wrapped_lines(values, capacity):
+    """
+    Number of lines each value takes as a string when wrapped to capacity characters per line.
+    Line breaks in the value start new lines. Breaking at spaces isn't accounted for.
+
+    :param values: Values to measure. Missing values are blank.
+    :type values: numpy.ndarray
+    :param capacity: Characters that fit on a line, for each value.
+    :type capacity: numpy.ndarray
+    :return: numpy.ndarray of int
+    """
+    texts = _pd.Series(values)
+    missing = texts.isna().values
+    if texts.dtype.kind != 'O' or _pd.api.types.infer_dtype(texts.values, skipna=True) not in ('string', 'empty'):
+        texts = texts.astype(str)
+    texts = texts.where(~missing, '')
+
+    lines = _np.maximum(_np.ceil(texts.str.len().values / capacity), 1)
+    for position in _np.flatnonzero(texts.str.contains('\n', regex=False).values):
+        lines[position] = sum(
+            max(_np.ceil(len(line) / capacity[position]), 1) for line in texts.iat[position].split('\n')
+        )
+    return lines.astype(_np.int64)
+
+
+def fit_column(column, codes, formats, fonts, header_font, settings):
+    """
+    Fit one column. Only takes picklable arguments so it can run in another process.
+
+    :param column: Column to fit.
+    :type column: pandas.Series
+    :param codes: Style code of each value.
+    :type codes: numpy.ndarray
+    :param formats: Number format of each distinct code, in order of appearance.
+    :type formats: list of str
+    :param fonts: (name, size, bold) of each distinct code. Only needed with settings.font_metrics.
+    :type fonts: dict
+    :param header_font: (name, size, bold) of the header.
+    :type header_font: tuple
+    :param settings: auto_fit options.
+    :type settings: FitSettings
+    :return: (width, most width could be below exact fit)
+    :rtype: tuple
+    """
+    dtype = column.dtype.name
+    rows = settings.rows
+    format_len = len(max(formats, key=len)) if not settings.empty else 0
+    header_len = len(column.name) + 2 if settings.include_header and column.name else 0
+    # Width of a digit relative to the default font's.
+    digit = 1
+    if settings.font_metrics:
+        digit = max(_metrics.digit_width(*font) for font in fonts.values()) / settings.unit if len(codes) else 1
+        if header_len:
+            header_len = _metrics.text_width(str(column.name), *header_font) / settings.unit + 2
+
+    def fit(width):
+        return max(min(max(width, header_len) * settings.scalar + settings.flat, settings.max_width),
+                   settings.min_width)
+
+    if settings.empty:
+        return fit(0), 0.0
+    if 'date' in dtype and _utils.NumberFormats.general not in formats:
+        return fit(format_len * digit), 0.0
+    if 'time' in dtype and _utils.NumberFormats.general not in formats:
+        return fit((format_len + len(str(int(column.dt.days.max())))) * digit), 0.0
+
+    estimated = rows is not None and column.dtype.kind not in 'iub'
+    measured = column.iloc[rows] if estimated else column
+    upper = settings.max_width
+    if 'float' in dtype:
+        if all('0.0' in e or e == '0' for e in formats):
+            width = (format_len + rounded_str_len(measured) - 2) * digit
+            if estimated:
+                upper = fit((format_len + float_str_len_bound(column, rounded=True) - 2) * digit)
+        else:
+            width = fixed_str_len(measured) * digit
+            if estimated:
+                upper = fit(float_str_len_bound(column) * digit)
+    elif settings.font_metrics and column.dtype.kind not in 'iu':
+        width = _text_len(measured.values, codes[rows] if estimated else codes, fonts) / settings.unit
+    else:
+        width = str_len(measured) * digit
+
+    width = fit(width)
+    return width, max(upper - width, 0.0) if estimated else 0.0
+
+
+def fit_columns(jobs, settings, executor=None, max_workers=None):
+    """
+    fit_column for each job, optionally in parallel. Results are in the order of jobs whichever finishes first.
+
+    A process pool gets numeric columns and style codes through shared memory where available (python 3.8+)
+    instead of pickling them. Other columns are pickled.
+
+    :param jobs: (column, codes, formats, fonts, header_font) for each column.
+    :type jobs: list of tuple
+    :param settings: auto_fit options.
+    :type settings: FitSettings
+    :param executor: 'thread', 'process', None to fit in this thread,
+        or an existing concurrent.futures.Executor (left running).
+    :param max_workers: Workers for a new thread or process pool. Defaults to the pool's default.
+    :type max_workers: int
+    :return: (width, error) for each job.
+    :rtype: list of tuple
+    """
+    if executor is None:
+        return [fit_column(*job, settings) for job in jobs]
+
+    pool = None
+    if executor == 'process':
+        executor = pool = _ProcessPoolExecutor(max_workers)
+    elif executor == 'thread':
+        executor = pool = _ThreadPoolExecutor(max_workers)
+    elif not isinstance(executor, _Executor):
+        raise ValueError('executor must be "process", "thread", None or a concurrent.futures.Executor')
+
+    blocks = []
+    try:
+        if isinstance(executor, _ProcessPoolExecutor) and _SharedMemory is not None:
+            jobs = [_share_job(job, blocks) for job in jobs]
+            return list(executor.map(_fit_shared, jobs, [settings] * len(jobs)))
+        return list(executor.map(fit_column, *zip(*jobs), [settings] * len(jobs))) if jobs else []
+    finally:
+        if pool is not None:
+            pool.shutdown()
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _text_len(values, codes, fonts):
+    """
+    Widest value in points. Measured once per distinct font.
+    """
+    groups = dict()
+    for code in _pd.unique(codes):
+        groups.setdefault(fonts[code], []).append(code)
+    return max(
+        _metrics.max_text_width(values if len(groups) == 1 else values[_np.isin(codes, group)], *key)
+        for key, group in groups.items()
+    )
+
+
+def _share(values, blocks):
+    """
+    Copy values to a new shared memory block, appended to blocks.
+    Values that aren't a plain numpy array of numbers or dates are returned as they are.
+    """
+    if not isinstance(values, _np.ndarray) or values.dtype.kind not in 'biufmM' or not values.nbytes:
+        return values
+    block = _SharedMemory(create=True, size=values.nbytes)
+    blocks.append(block)
+    _np.ndarray(values.shape, values.dtype, buffer=block.buf)[...] = values
+    return SharedArray(block.name, values.dtype.str, values.shape)
+
+
+def _share_job(job, blocks):
+    column, codes, formats, fonts, header_font = job
+    values = _share(column.values, blocks)
+    if values is not column.values:
+        column = (values, column.name)
+    return column, _share(codes, blocks), formats, fonts, header_font
+
+
+def _fit_shared(job, settings):
+    """
+    fit_column for a job from _share_job, run in a pool process.
+    """
+    column, codes, formats, fonts, header_font = job
+    attached = []
+
+    def attach(shared):
+        block = _SharedMemory(shared.name)
+        attached.append(block)
+        return _np.ndarray(shared.shape, _np.dtype(shared.dtype), buffer=block.buf)
+
+    try:
+        if isinstance(column, tuple):
+            values, name = column
+            column = _pd.Series(attach(values), name=name)
+        if isinstance(codes, SharedArray):
+            codes = attach(codes)
+        return fit_column(column, codes, formats, fonts, header_font, settings)
+    finally:
+        del column, codes
+        for block in attached:
+            try:
+                block.close()
+            except BufferError:
+                # Still referenced by something pandas cached. Released when the process exits.
+                pass
+
+
+def _slow_max(values, func):
+    """
+    Longest func(value) over the distinct values.
+    """
+    return max(len(func(value)) for value in _pd.unique(values))
+
+
+if __name__ == '__main__':
+    pass
@@ -0,0 +1,114 @@
+from concurrent.futures import Executor as _Executor, ProcessPoolExecutor as _ProcessPoolExecutor, \
+    ThreadPoolExecutor as _ThreadPoolExecutor
+from zipfile import ZIP_DEFLATED as _ZIP_DEFLATED, ZipFile as _ZipFile
+
+from openpyxl import Workbook as _Workbook
+
+from . import spreadsheetml as _spreadsheetml
+from .registry import register_named_styles as _register_named_styles
+
+__all__ = ['WorkbookBuilder']
+
+
+class WorkbookBuilder:
+
+    def __init__(self):
+        """
+        Export many XlFrames to one new workbook, one sheet each.
+
+        Styles from every frame are merged into the workbook in a single pass.
+        Sheet XML is then rendered in parallel and the package assembled as each sheet finishes.
+        Uses the same writer as XlFrame.to_excel(engine='xlframe').
+        """
+        self.sheets = []
+
+    def add(self, xf, sheet_name, **kwargs):
+        """
+        Add XlFrame as a new sheet.
+
+        :param xf: XlFrame to export.
+        :type xf: xlframe.XlFrame
+        :param sheet_name: Sheet name.
+        :type sheet_name: str
+        :param kwargs: Export options. Same as XlFrame.to_excel: protect_sheet, right_to_left, columns_to_hide,
+            add_filters, auto_fit, index, header, startcol, startrow, index_label, na_rep, float_format, inf_rep,
+            freeze_panes.
+        :return: self
+        """
+        self.sheets.append((sheet_name, xf, kwargs))
+        return self
+
+    def save(self, file, executor='process', max_workers=None):
+        """
+        Write workbook.
+
+        Styles and sheet settings are worked out in this process first, then each sheet's cells are rendered
+        by executor. Rendering is pure python, so threads are limited by the GIL; use processes to use more cores.
+
+        :param file: Path or binary file object to write to.
+        :param executor: 'process', 'thread', None to render in this thread,
+            or an existing concurrent.futures.Executor (left running).
+        :param max_workers: Workers for a new process or thread pool. Defaults to the pool's default.
+        :type max_workers: int
+        :return: None
+        """
+        book = _Workbook()
+        book.remove(book.active)
+
+        pool = None
+        if executor == 'process':
+            executor = pool = _ProcessPoolExecutor(max_workers)
+        elif executor == 'thread':
+            executor = pool = _ThreadPoolExecutor(max_workers)
+        elif executor is not None and not isinstance(executor, _Executor):
+            raise ValueError('executor must be "process", "thread", None or a concurrent.futures.Executor')
+
+        try:
+            parts = dict()
+            style_names = self.merge_styles(book)
+            for (sheet_name, xf, kwargs), names in zip(self.sheets, style_names):
+                sheet = book.create_sheet(sheet_name)
+                data = _spreadsheetml.prepare_sheet(xf, book, sheet, style_names=names, **kwargs)
+                if executor is not None:
+                    # Rendering starts while the next sheet is prepared.
+                    data = _spreadsheetml.RenderedSheet(
+                        data.dimension, executor.submit(_spreadsheetml.render, data), data.hyperlinks
+                    )
+                parts[sheet.title] = data
+
+            archive = _ZipFile(file, 'w', _ZIP_DEFLATED, allowZip64=True)
+            _spreadsheetml.PackageWriter(book, archive, parts).save()
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+    def merge_styles(self, book):
+        """
+        Add the named styles every frame uses to book.
+        The frames' styles are merged by name and fingerprint first, so a style shared by many frames is added once,
+        then registered against book in a single pass.
+        Styles whose name is taken by a different style are renamed, same as exporting frames one at a time.
+
+        :param book: openpyxl workbook
+        :return: Style names indexed by style code, for each added frame. See XlFrame._export_style_names.
+        :rtype: list of list
+        """
+        plans = [xf._export_plan() for _, xf, _ in self.sheets]
+        # (name, fingerprint): style, in the order frames first use them.
+        merged = dict()
+        for (_, xf, _), (_, exported, named) in zip(self.sheets, plans):
+            if not named:
+                continue
+            registry = xf._named_styles
+            for code in exported:
+                style = registry.style(code)
+                merged.setdefault((style.name, registry.key(style)), style)
+
+        keys = {id(style): key for (_, key), style in merged.items()}
+        names = _register_named_styles(book, list(merged.values()), key=lambda style: keys[id(style)])
+        added = dict(zip(merged, names))
+        return [xf._export_style_names(book, plan, added) for (_, xf, _), plan in zip(self.sheets, plans)]
+
+
+if __name__ == '__main__':
+    pass
@@ -1,29 +1,43 @@
-import datetime as _dt
+import asyncio as _asyncio
 import os as _os
 import weakref as _weakref
 from copy import copy as _copy
+from functools import partial as _partial
 from itertools import count as _count
 
+import numpy as _np
 import pandas as _pd
-from openpyxl import load_workbook as _load_workbook
+from openpyxl import Workbook as _Workbook, load_workbook as _load_workbook
+from openpyxl.formatting.rule import FormulaRule as _FormulaRule
+from openpyxl.styles import PatternFill as _PatternFill
+from openpyxl.styles.cell_style import StyleArray as _StyleArray
 from openpyxl.styles.builtins import styles as _styles
 from openpyxl.utils import get_column_letter as _get_column_letter
 from openpyxl.worksheet import table as _table
 from openpyxl.worksheet.hyperlink import Hyperlink as _Hyperlink
-
-from . import utils as _utils
+from pandas.api.types import is_datetime64_any_dtype as _is_datetime64_any_dtype, \
+    is_timedelta64_dtype as _is_timedelta64_dtype
+
+from . import aio as _aio, metrics as _metrics, sparse as _sparse, spreadsheetml as _spreadsheetml, \
+    streaming as _streaming, utils as _utils, widths as _widths, xlsxwriter_engine as _xlsxwriter_engine
+from .registry import CODE_DTYPE as _CODE_DTYPE, NameCounter as _NameCounter, StyleRegistry as _StyleRegistry, \
+    add_named_styles as _add_named_styles, apply_style as _apply_style, runs as _runs, split_name as _split_name, \
+    unnamed_format as _unnamed_format
 from .style import Style as _Style
 
 __all__ = ['XlFrame']
-_no_time = _dt.time(0)
-_filler = {'fill_pattern': _utils.FillPattern.solid}
+# Integer ticks of NaT.
+_NAT = _np.iinfo(_np.int64).min
+# Rules style_where resolves together. Bits of an int64 besides the sign.
+_RULE_BITS = 63
 
 
 class XlFrame:
     utils = _utils
 
     def __init__(self, dataframe, style=None, header_style=None, index_style=None, *, number_style=None,
-                 date_style=None, datetime_style=None, timedelta_style=None, use_default_formats=True):
+                 date_style=None, datetime_style=None, timedelta_style=None, use_default_formats=True,
+                 sparse=False):
         """
         Class for styling dataframes. Styling based around openpyxl's NamedStyle.
         xlframe.Style available as an alternative to using NamedStyle.
@@ -47,6 +61,10 @@ class XlFrame:
 
         Default type specific styling adjusts alignment and number format of style arg.
 
+        sparse=True stores styles and row heights as per column defaults plus the ranges assigned to,
+        for frames that are mostly one style. Memory then depends on the number of assignments
+        rather than the size of the frame. Styles are only expanded out when exporting.
+
         :param dataframe: DateFrame to style.
         :type dataframe: pandas.DataFrame.
         :param style: Initial style to apply to frame. Default xlframe.Style.default_style().
@@ -73,14 +91,15 @@ class XlFrame:
         :type timedelta_style: openpyxl.NamedStyle or xlframe.Style.
         :param use_default_formats: Apply default formatting where a style is not supplied.
         :type use_default_formats: Boolean.
+        :param sparse: Store styles and row heights sparsely.
+        :type sparse: Boolean.
         """
         if not isinstance(dataframe, _pd.DataFrame):
             raise TypeError('Expected type {}, got {} instead'.format(_pd.DataFrame, dataframe.__class__))
         if isinstance(dataframe.index, _pd.MultiIndex) or isinstance(dataframe.columns, _pd.MultiIndex):
             raise NotImplementedError('No support for pandas.MultiIndex on index or columns.')
 
-        self.named_styles = dict()
-        self._named_styles = _styles.copy()
+        self._named_styles = _StyleRegistry(_styles.values())
         self.builtins = tuple(sorted(_styles))
 
         if not style:
@@ -120,21 +139,43 @@ class XlFrame:
             header_style = self._style_parser(header_style if header_style else style)
 
         self.dataframe = self.df = dataframe
-        self._styleframe = self._sf = _pd.DataFrame(
-            data=style, index=self.dataframe.index, columns=self.dataframe.columns
-        )
-
-        self._index_styles = _pd.Series(data=index_style, index=self.dataframe.index, name='IndexStyles')
-        self._header_styles = _pd.Series(data=header_style, index=self.dataframe.columns, name='HeaderStyles')
+        # Styles are stored as integer codes of self._named_styles.
+        if sparse:
+            self._styleframe = self._sf = _sparse.SparseFrame(
+                self._style_code(style), index=self.dataframe.index, columns=self.dataframe.columns,
+                dtype=_CODE_DTYPE
+            )
+        else:
+            self._styleframe = self._sf = _pd.DataFrame(
+                data=self._style_code(style), index=self.dataframe.index, columns=self.dataframe.columns,
+                dtype=_CODE_DTYPE
+            )
 
-        self._row_heights = _pd.Series(
-            data=float(_utils.Options.default_row_height), index=self.dataframe.index, name='RowHeights'
+        self._index_styles = _pd.Series(
+            data=self._style_code(index_style), index=self.dataframe.index, name='IndexStyles', dtype=_CODE_DTYPE
+        )
+        self._header_styles = _pd.Series(
+            data=self._style_code(header_style), index=self.dataframe.columns, name='HeaderStyles',
+            dtype=_CODE_DTYPE
         )
+
+        if sparse:
+            self._row_heights = _sparse.SparseSeries(
+                float(_utils.Options.default_row_height), index=self.dataframe.index, name='RowHeights',
+                dtype=float
+            )
+        else:
+            self._row_heights = _pd.Series(
+                data=float(_utils.Options.default_row_height), index=self.dataframe.index, name='RowHeights'
+            )
         self._column_widths = _pd.Series(
             data=float(_utils.Options.default_column_width), index=self.dataframe.columns, name='ColumnWidths'
         )
 
         self._index_width = float(_utils.Options.default_column_width)
+        # How far auto_fit estimates could be below the exact fit.
+        self._column_width_errors = _pd.Series(data=0.0, index=self.dataframe.columns, name='ColumnWidthErrors')
+        self._index_width_error = 0.0
         self._header_height = float(_utils.Options.default_row_height)
 
         self._styleframe.style_loc = _StyleIndexer(self, self._styleframe.loc)
@@ -144,10 +185,13 @@ class XlFrame:
         self._header_styles.style_idxr = _SeriesIndexer(self, self._header_styles)
 
         self._table_args = None
+        self._kinds = None
+        self._conditional_formats = []
         self._hyperlinks = None
         self._slicer = _Slicer(self, 'loc')
         self._islicer = _Slicer(self, 'iloc')
         self._defaults_used = use_default_formats
+        self._sparse = sparse
 
         if number_style or date_style or datetime_style or timedelta_style:
             self._style_by_type(
@@ -162,11 +206,23 @@ class XlFrame:
 
     def to_excel(self, excel_writer='output.xlsx', sheet_name='Sheet1', *, protect_sheet=False,
                  right_to_left=False, columns_to_hide=None, add_filters=False, replace_sheet=False,
-                 auto_fit=None, **kwargs):
+                 auto_fit=None, write_only=False, **kwargs):
         """
         Export to excel. Supports .xlsx/.xlsm. See pandas.DataFrame.to_excel() for more.
 
+        Write only export writes values and styles together in a single pass through
+        openpyxl's write only worksheets. Used when write_only=True or excel_writer's
+        book is a write only workbook. See XlFrame.ExcelWriter(write_only=True).
+
+        engine='xlframe' generates the sheet XML directly from the dataframe and its styles
+        without creating openpyxl cells. Writes a new workbook to a file path or binary file object.
+
+        engine='xlsxwriter' or an xlsxwriter excel_writer translates each style into an xlsxwriter Format once
+        and writes a row at a time. Sheets are always new, xlsxwriter cannot edit them.
+        A path is written in constant_memory mode unless formatting as table.
+
         :param excel_writer: ExcelWriter or file path to export to.
+            engine='xlframe' and engine='xlsxwriter' also take a binary file object.
         :type excel_writer: ExcelWriter or string.
         :param sheet_name: Sheet name to export to.
         :type sheet_name: string.
@@ -180,12 +236,17 @@ class XlFrame:
         :type add_filters: boolean.
         :param replace_sheet: If sheet_name already exists delete it first.
         :type replace_sheet: boolean.
-        :param auto_fit: Columns to autofit. Can pass True to fit all columns.
-        :type auto_fit: list-like or boolean.
+        :param auto_fit: Columns to autofit. Can pass True to fit all columns,
+            or a dict of auto_fit kwargs e.g. {'sample': 10000}.
+        :type auto_fit: list-like, boolean or dict.
+        :param write_only: Create a write only workbook when excel_writer is a path.
+        :type write_only: boolean.
         :param kwargs: Passed to pandas.DataFrame.to_excel().
-        :return: pandas.ExcelWriter.
+            Write only export and engine='xlframe' support index_label, na_rep, float_format, inf_rep
+            and freeze_panes.
+        :return: pandas.ExcelWriter. excel_writer as given for engine='xlframe'.
         """
-        save = kwargs.pop('save', isinstance(excel_writer, str))
+        save = kwargs.pop('save', isinstance(excel_writer, str) or hasattr(excel_writer, 'write'))
 
         # pandas.to_excel defaults
         index = kwargs.pop('index', True)
@@ -204,28 +265,68 @@ class XlFrame:
             return self.loc[:, columns].to_excel(
                 excel_writer=excel_writer, sheet_name=sheet_name, protect_sheet=protect_sheet,
                 right_to_left=right_to_left, columns_to_hide=columns_to_hide, add_filters=add_filters,
-                replace_sheet=replace_sheet, auto_fit=auto_fit, header=header, index=index,
-                startcol=startcol, startrow=startrow, engine=engine, save=save, **kwargs
+                replace_sheet=replace_sheet, auto_fit=auto_fit, write_only=write_only, header=header,
+                index=index, startcol=startcol, startrow=startrow, engine=engine, save=save, **kwargs
+            )
+
+        if engine == 'xlframe':
+            if isinstance(excel_writer, str):
+                if _os.path.splitext(excel_writer)[1] not in ('.xlsx', '.xlsm'):
+                    raise ValueError(
+                        'Unsupported file extension {}. Use .xlsx/.xlsm.'.format(_os.path.splitext(excel_writer)[1])
+                    )
+            elif not hasattr(excel_writer, 'write'):
+                raise ValueError('Engine xlframe exports to a file path or binary file object.')
+            _spreadsheetml.write(
+                self, excel_writer, sheet_name, protect_sheet=protect_sheet, right_to_left=right_to_left,
+                columns_to_hide=columns_to_hide, add_filters=add_filters, auto_fit=auto_fit, index=index,
+                header=header, startcol=startcol, startrow=startrow, **kwargs
             )
+            return excel_writer
 
-        if isinstance(excel_writer, str):
-            excel_writer = self.ExcelWriter(excel_writer)
-        elif 'openpyxl' not in excel_writer.engine:
-            raise ValueError('Engine for excel_writer must be openpyxl.')
+        if engine == 'xlsxwriter' and (isinstance(excel_writer, str) or hasattr(excel_writer, 'write')):
+            excel_writer = self.ExcelWriter(
+                excel_writer, engine=engine, options={'constant_memory': not self._table_args}
+            )
+        elif isinstance(excel_writer, str):
+            excel_writer = self.ExcelWriter(excel_writer, write_only=write_only)
+        elif excel_writer.engine not in ('openpyxl', 'xlsxwriter'):
+            raise ValueError('Engine for excel_writer must be openpyxl or xlsxwriter.')
 
-        if _os.path.splitext(excel_writer.path)[1] not in excel_writer.supported_extensions:
+        if isinstance(excel_writer.path, str) \
+                and _os.path.splitext(excel_writer.path)[1] not in excel_writer.supported_extensions:
             raise ValueError(
                 'Unsupported file extension {}. Use {}.'.format(
                     _os.path.splitext(excel_writer.path)[1], '/'.join(excel_writer.supported_extensions)
                 )
             )
 
+        if excel_writer.engine == 'xlsxwriter':
+            _xlsxwriter_engine.write_sheet(
+                self, excel_writer, sheet_name, protect_sheet=protect_sheet, right_to_left=right_to_left,
+                columns_to_hide=columns_to_hide, add_filters=add_filters, auto_fit=auto_fit, index=index,
+                header=header, startcol=startcol, startrow=startrow, **kwargs
+            )
+            if save:
+                excel_writer.save()
+            return excel_writer
+
         if replace_sheet:
             if sheet_name in excel_writer.book:
                 del excel_writer.book[sheet_name]
             if sheet_name in excel_writer.sheets:
                 del excel_writer.sheets[sheet_name]
 
+        if getattr(excel_writer.book, 'write_only', False):
+            _streaming.write_sheet(
+                self, excel_writer.book, sheet_name, protect_sheet=protect_sheet, right_to_left=right_to_left,
+                columns_to_hide=columns_to_hide, add_filters=add_filters, auto_fit=auto_fit, index=index,
+                header=header, startcol=startcol, startrow=startrow, **kwargs
+            )
+            if save:
+                excel_writer.save()
+            return excel_writer
+
         self.dataframe.to_excel(
             excel_writer, sheet_name=sheet_name, engine=engine, header=header,
             index=index, startcol=startcol, startrow=startrow, columns=columns, **kwargs
@@ -236,12 +337,10 @@ class XlFrame:
         sheet.sheet_view.rightToLeft = right_to_left
 
         # add named styles. Rename any whose name is already taken within book.
-        renamed_styles = self._add_named_styles(book)
+        style_names = self._export_style_names(book)
+        templates = dict()
 
-        if auto_fit is not None and auto_fit is not False:
-            if auto_fit is True:
-                auto_fit = self.columns
-            self.auto_fit(auto_fit, index=index, include_header=bool(header))
+        self._fit_for_export(auto_fit, index=index, include_header=bool(header))
 
         # index styles
         if index:
@@ -250,12 +349,11 @@ class XlFrame:
                 index_label = 'index'
                 current_cell.value = index_label  # Otherwise formatting as table will auto give it a ColumnX name.
             if header:  # TODO: Style this cell properly
-                current_cell.style = self._header_styles.iat[0]
-            offset = 2 if header else 1
-            for row_index, index_style in enumerate(self._index_styles.iteritems()):
-                index_value, style = index_style
-                current_cell = sheet.cell(row=row_index + startrow + offset, column=startcol + 1)
-                current_cell.style = renamed_styles.get(style, style)
+                _apply_style(current_cell, style_names[self._header_styles.iat[0]])
+            offset = 1 if header else 0
+            self._style_column(
+                sheet, self._index_styles.values, startrow + offset, startcol + 1, style_names, templates
+            )
             # set index width
             sheet.column_dimensions[self.get_column_letter(startcol)].width = self._index_width
             # adjust startcol for added index column
@@ -266,7 +364,7 @@ class XlFrame:
             for col_index, col_style in enumerate(self._header_styles.iteritems()):
                 col_name, style = col_style
                 current_cell = sheet.cell(row=startrow + 1, column=col_index + startcol + 1)
-                current_cell.style = renamed_styles.get(style, style)
+                _apply_style(current_cell, style_names[style])
             # set header height
             sheet.row_dimensions[startrow + 1].height = self.header_height
             # adjust startrow for header row
@@ -275,10 +373,7 @@ class XlFrame:
         # data styles
         for col_index, col_series in enumerate(self._styleframe.iteritems()):
             col_name, column = col_series
-            for row_index, index_style in enumerate(column.iteritems()):
-                index_value, style = index_style
-                current_cell = sheet.cell(row=row_index + startrow + 1, column=col_index + startcol + 1)
-                current_cell.style = renamed_styles.get(style, style)
+            self._style_column(sheet, column.values, startrow, col_index + startcol + 1, style_names, templates)
 
         # add any hyperlinks
         if self._hyperlinks is not None:
@@ -316,39 +411,15 @@ class XlFrame:
 
         # format as table if needed
         if self._table_args:
-            tables = {tbl.name for sht in book.worksheets for tbl in sht._tables}
-
-            rows = None if not self.dataframe.empty else (0, 1)
-            self._table_args['ref'] = self._get_range_as_str(
-                row_index=rows, startcol=startcol, startrow=headerrow, index=index
-            )
-
-            if 'name' in self._table_args:
-                self._table_args['displayName'] = self._table_args.pop('name')
-            if self._table_args.get('displayName', None) in tables:
-                raise ValueError('Table name "{}" already exists in book.'.format(self._table_args['displayName']))
-
-            if 'displayName' not in self._table_args:
-                # find next available table name
-                for i in _count(1):
-                    if 'Table{}'.format(i) not in tables:
-                        tbl = _table.Table(
-                            displayName='Table{}'.format(i),
-                            **self._table_args
-                        )
-                        break
-            else:
-                tbl = _table.Table(
-                    **self._table_args
-                )
-
-            sheet.add_table(tbl)
+            sheet.add_table(self._table(book, startcol=startcol, startrow=headerrow, index=index))
 
         elif add_filters:
             sheet.auto_filter.ref = self._get_range_as_str(
                 row_index=0, startcol=startcol, startrow=headerrow, index=index
             )
 
+        self._add_conditional_formats(sheet, startcol=startcol, startrow=startrow)
+
         # Hide columns
         if columns_to_hide:
             if isinstance(columns_to_hide, (str, int)):
@@ -369,31 +440,259 @@ class XlFrame:
 
         return excel_writer
 
-    def _add_named_styles(self, book):
+    async def to_excel_async(self, excel_writer='output.xlsx', sheet_name='Sheet1', *, executor=None, **kwargs):
+        """
+        Awaitable to_excel. Styling and export run on executor so the event loop isn't blocked.
+        Frame shouldn't be modified until the export is done.
+
+        :param excel_writer: Same as to_excel.
+        :param sheet_name: Sheet name to export to.
+        :type sheet_name: string.
+        :param executor: concurrent.futures executor to export on. Loop's default executor if unspecified.
+        :param kwargs: Same as to_excel.
+        :return: Same as to_excel.
+        """
+        loop = _asyncio.get_event_loop()
+        return await loop.run_in_executor(executor, _partial(self.to_excel, excel_writer, sheet_name, **kwargs))
+
+    def to_excel_stream(self, sheet_name='Sheet1', *, executor=None, chunk_size=_aio.CHUNK_SIZE, **kwargs):
+        """
+        Export to an async iterator of bytes of the finished file, for sending as it is generated:
+            async for chunk in xf.to_excel_stream():
+                await response.write(chunk)
+
+        Export runs on executor once iteration starts. Iterate to the end or call aclose() on the iterator.
+        Frame shouldn't be modified until the export is done.
+
+        :param sheet_name: Sheet name to export to.
+        :type sheet_name: string.
+        :param executor: concurrent.futures thread pool to export on. Loop's default executor if unspecified.
+        :param chunk_size: Minimum bytes in each chunk, apart from the last.
+        :type chunk_size: int
+        :param kwargs: Same as to_excel. engine='xlframe' (default) or 'xlsxwriter'.
+        :return: Async iterator of bytes.
+        """
+        engine = kwargs.pop('engine', 'xlframe')
+        if engine not in ('xlframe', 'xlsxwriter'):
+            raise ValueError('Streamed export needs engine xlframe or xlsxwriter.')
+        return _aio.ExcelStream(
+            _partial(self.to_excel, sheet_name=sheet_name, engine=engine, **kwargs), executor=executor,
+            chunk_size=chunk_size
+        )
+
+    @classmethod
+    def to_excel_chunks(cls, chunks, excel_writer='output.xlsx', sheet_name='Sheet1', *, column_styles=None,
+                        header_styles=None, style_chunk=None, frame_kwargs=None, **kwargs):
+        """
+        Export an iterable of dataframes to a single sheet without holding more than one in memory.
+        For dataframes too big to style in one piece, e.g. from pandas.read_csv(chunksize=...).
+
+        Each chunk is wrapped in an XlFrame, styled and written before the next is read.
+        Written with the same writer as engine='xlframe'. Rows are spooled to a temporary file until the end.
+
+        :param chunks: Dataframes with the same columns, in row order.
+        :type chunks: iterable of pandas.DataFrame
+        :param excel_writer: File path or binary file object to export to.
+        :param sheet_name: Sheet name to export to.
+        :type sheet_name: string.
+        :param column_styles: Style for each column, by column name. Replaces type based default style.
+        :type column_styles: dict
+        :param header_styles: Style for each column header, by column name.
+        :type header_styles: dict
+        :param style_chunk: Called with each chunk's XlFrame and the number of rows before it,
+            for any other styling. Header styles and column widths only count for the first chunk.
+            Conditional formats are taken from the first chunk and cover every chunk.
+        :type style_chunk: callable
+        :param frame_kwargs: Passed to XlFrame() for each chunk. Type based styles, sparse etc.
+        :type frame_kwargs: dict
+        :param kwargs: Export options. Same as to_excel with engine='xlframe'.
+            auto_fit fits each column to its widest value across all chunks.
+        :return: excel_writer
+        """
+        if isinstance(excel_writer, str) and _os.path.splitext(excel_writer)[1] not in ('.xlsx', '.xlsm'):
+            raise ValueError(
+                'Unsupported file extension {}. Use .xlsx/.xlsm.'.format(_os.path.splitext(excel_writer)[1])
+            )
+
+        def frames():
+            rows = 0
+            for chunk in chunks:
+                xf = cls(chunk, **(frame_kwargs or dict()))
+                for column, style in (column_styles or dict()).items():
+                    xf[column] = style
+                for column, style in (header_styles or dict()).items():
+                    xf.header_styles[column] = style
+                if style_chunk is not None:
+                    style_chunk(xf, rows)
+                rows += len(xf)
+                yield xf
+
+        _spreadsheetml.write_chunks(frames(), excel_writer, sheet_name, **kwargs)
+        return excel_writer
+
+    def _table(self, book, startcol=0, startrow=0, index=False):
+        """
+        Create table for exported range from table args.
+
+        :param book: openpyxl workbook being exported to. Used to check for existing table names.
+        :param startcol: column offset of first data column.
+        :type startcol: int
+        :param startrow: row offset of header row.
+        :type startrow: int
+        :param index: Include index column in table range.
+        :type index: bool
+        :return: openpyxl.worksheet.table.Table
+        """
+        tables = {tbl.name for sht in book.worksheets for tbl in sht._tables}
+
+        rows = None if not self.dataframe.empty else (0, 1)
+        self._table_args['ref'] = self._get_range_as_str(
+            row_index=rows, startcol=startcol, startrow=startrow, index=index
+        )
+
+        if 'name' in self._table_args:
+            self._table_args['displayName'] = self._table_args.pop('name')
+        if self._table_args.get('displayName', None) in tables:
+            raise ValueError('Table name "{}" already exists in book.'.format(self._table_args['displayName']))
+
+        if 'displayName' not in self._table_args:
+            # find next available table name
+            for i in _count(1):
+                if 'Table{}'.format(i) not in tables:
+                    return _table.Table(
+                        displayName='Table{}'.format(i),
+                        **self._table_args
+                    )
+
+        return _table.Table(
+            **self._table_args
+        )
+
+    @staticmethod
+    def _style_column(sheet, codes, startrow, column, style_names, templates):
+        """
+        Style a column of cells. Each distinct style is applied by name once,
+        after that its style array is copied into each cell of its runs.
+        Every cell still gets its own style array as openpyxl edits them in place, so this is per cell work.
+        engine='xlframe' avoids creating cells at all.
+
+        :param sheet: Sheet to style.
+        :type sheet: openpyxl.worksheet.worksheet.Worksheet
+        :param codes: Style code for each cell.
+        :type codes: numpy.ndarray
+        :param startrow: Row offset of the first cell. 0 indexed.
+        :type startrow: int
+        :param column: Column number. 1 indexed.
+        :type column: int
+        :param style_names: Style name in book, or unnamed format, by code. See _export_style_names.
+        :type style_names: list
+        :param templates: Style array by code. Shared between calls for the same sheet.
+        :type templates: dict
+        :return: None
+        """
+        for start, stop, code in _runs(codes):
+            template = templates.get(code)
+            if template is None:
+                current_cell = sheet.cell(row=startrow + start + 1, column=column)
+                _apply_style(current_cell, style_names[code])
+                template = templates[code] = _StyleArray(current_cell._style)
+            cells = sheet._cells
+            for row in range(startrow + start + 1, startrow + stop + 1):
+                cell = cells.get((row, column))
+                if cell is None:
+                    cell = sheet.cell(row=row, column=column)
+                cell._style = _StyleArray(template)
+
+    def _export_plan(self):
+        """
+        Styles frame exports. Unused styles are left out. Identical styles numbered from the same name
+        are exported as the first of them.
+        Past utils.Options.max_named_styles styles, custom styles are exported as unnamed cell formats instead.
+
+        :return: (canonical, exported, named). Code each style is exported as, see _canonical_codes.
+            Codes of custom styles to export. Whether they are exported as named styles.
+        :rtype: tuple
+        """
+        used = self._used_codes()
+        canonical = self._canonical_codes(used)
+        exported = _np.flatnonzero(used & (canonical == _np.arange(len(canonical))))
+        exported = exported[exported >= len(self.builtins)]
+        limit = _utils.Options.max_named_styles
+        return canonical, exported, limit is None or len(exported) <= limit
+
+    def _export_style_names(self, book, plan=None, added=None):
+        """
+        Add the named styles frame uses to workbook and get the name each style code was exported under.
+
+        :param book: openpyxl workbook
+        :param plan: Result of _export_plan. Worked out if unspecified.
+        :type plan: tuple
+        :param added: Name in book of each style already added, by (name, fingerprint).
+            Styles are added to book if unspecified. See WorkbookBuilder.merge_styles.
+        :type added: dict
+        :return: Style names indexed by style code. Unnamed formats in place of names if exported without names.
+        :rtype: list
+        """
+        canonical, exported, named = self._export_plan() if plan is None else plan
+        registry = self._named_styles
+        names = list(registry.names)
+        if not named:
+            for code in exported:
+                names[code] = _unnamed_format(book, registry.style(code))
+        elif added is None:
+            renamed_styles = self._add_named_styles(book, exported)
+            names = [renamed_styles.get(name, name) for name in names]
+        else:
+            for code in exported:
+                names[code] = added[(names[code], registry.key(registry.style(code)))]
+        return [names[code] for code in canonical]
+
+    def _add_named_styles(self, book, codes=None):
         """
         Add named styles for frame to existing workbook.
-        Rename any that already exist within workbook.
+        Rename any that already exist within workbook. See registry.add_named_styles.
 
         :param book: openpyxl workbook
+        :param codes: Codes of styles to add. All styles added to frame if unspecified.
+        :type codes: list-like
         :return: dict mapping old name: new name for styles that had to be renamed.
         """
-        new_styles = dict()
-        existing_styles = None
-        for name, style in self.named_styles.items():
-            try:
-                book.add_named_style(style)
-            except ValueError:  # Style Exists
-                if existing_styles is None:
-                    existing_styles = self.named_styles.copy()
-                    existing_styles.update({s.name: s for s in book._named_styles})
-                style = _Style(style)
-                if not self._style_eq(style, existing_styles[name]):
-                    # Problem with _copy(style). Using _Style(style).named_style as a way to create a copy.
-                    style = style.named_style
-                    existing_styles[self._rename(style, existing_styles)] = style
-                    book.add_named_style(style)
-                    new_styles[name] = style.name
-        return new_styles
+        if codes is None:
+            styles = self.named_styles.values()
+        else:
+            styles = [self._named_styles.style(code) for code in codes]
+        return _add_named_styles(book, styles, key=self._named_styles.key)
+
+    def _used_codes(self):
+        """
+        Style codes used by cells, index or headers.
+
+        :return: Whether each style code is used, indexed by code.
+        :rtype: numpy.ndarray of bool
+        """
+        used = _np.zeros(len(self._named_styles), dtype=bool)
+        cells = self._styleframe.distinct() if self._sparse else self._styleframe.values.ravel()
+        for codes in (cells, self._index_styles.values, self._header_styles.values):
+            used[codes] = True
+        return used
+
+    def _canonical_codes(self, used):
+        """
+        Code each style is exported as. Used custom styles that are identical to an earlier one
+        numbered from the same name, ('Style', 'Style[1]', 'Style[2]' ...), map to that one.
+        Others map to themselves.
+
+        :param used: Whether each style code is used, indexed by code.
+        :type used: numpy.ndarray of bool
+        :return: numpy.ndarray indexed by code
+        """
+        registry = self._named_styles
+        canonical = _np.arange(len(registry), dtype=_CODE_DTYPE)
+        firsts = dict()
+        for code in _np.flatnonzero(used[len(self.builtins):]) + len(self.builtins):
+            key = self._find_name_num(registry.name(code))[0], registry.style_id(code)
+            canonical[code] = firsts.setdefault(key, code)
+        return canonical
 
     def _style_by_type(self, idxr=None, index=False, default_style=None, number_style=None,
                        date_style=None, datetime_style=None, timedelta_style=None):
@@ -409,69 +708,72 @@ class XlFrame:
         :return: None
         """
         idxr = _Slicer._idxr_for_frame(idxr)
-        frame = self.dataframe.loc[idxr[0], idxr[1]]
-        styles = self._styleframe.loc[idxr[0], idxr[1]]
+        column_kinds, index_kind = self._dtype_kinds()
+        column_kinds = column_kinds.loc[idxr[1]]
 
-        if frame.empty:
+        if not len(column_kinds) or not len(self.index.to_series().loc[idxr[0]]):
             return
 
-        if index:
-            frame = frame.reset_index()
-            index_name = frame.columns[0]
-            styles[index_name] = ''
-
-        if default_style:
-            styles.loc[:, :] = self._style_parser(default_style)
-
-        if date_style or datetime_style:
-            datetimes = frame.select_dtypes(include=['datetime', 'datetimetz']).columns
-            date_cols = [
-                col for col in datetimes if self._is_date_col(frame[col])
-            ]
-            datetime_cols = [
-                e for e in datetimes if e not in date_cols
-            ]
-
-            if date_style and date_cols:
-                styles.loc[:, date_cols] = self._style_parser(date_style)
-            if datetime_style and datetime_cols:
-                styles.loc[:, datetime_cols] = self._style_parser(datetime_style)
-
-        if number_style:
-            styles.loc[:, frame.select_dtypes(include='number').columns] = self._style_parser(number_style)
-
-        if timedelta_style:
-            styles.loc[:, frame.select_dtypes(include='timedelta').columns] = self._style_parser(timedelta_style)
+        # style code for each kind of column. Columns of other kinds get the default style.
+        codes = dict()
+        default = self._style_code(default_style) if default_style else -1
+        for kind, style in (('date', date_style), ('datetime', datetime_style), ('number', number_style),
+                            ('timedelta', timedelta_style)):
+            if style and (kind in ('number', 'timedelta') or (column_kinds == kind).any()
+                          or index and index_kind == kind):
+                codes[kind] = self._style_code(style)
 
         if index:
             self.index_styles.loc[idxr[0]] = self._style_parser(
-                _Style._default_index_style(self._named_styles[styles.pop(index_name).iat[0]])
+                _Style._default_index_style(self._named_styles.style(codes.get(index_kind, default)))
             )
 
-        self._styleframe.loc[idxr[0], idxr[1]] = styles
+        styles = _pd.Series([codes.get(kind, default) for kind in column_kinds], index=column_kinds.index)
+        for code, columns in styles[styles >= 0].groupby(styles).groups.items():
+            self._styleframe.loc[idxr[0], list(columns)] = _CODE_DTYPE(code)
 
-    @staticmethod
-    def _is_date_col(column):
+    def _dtype_kinds(self):
         """
-        Check if column is datetime and no entries have a time component.
+        Kind of type based style each column and the index gets. Worked out once and reused.
 
-        :param column: pandas.Series
-        :return: boolean
+        :return: (pandas.Series of kinds by column, index kind). See _dtype_kind.
+        :rtype: tuple
         """
-        try:
-            return (column.loc[column.notnull()].dt.time != _no_time).sum() == 0
-        except AttributeError:
-            return False
+        if self._kinds is None:
+            frame = self.dataframe
+            kinds = [_dtype_kind(dtype) for dtype in frame.dtypes]
+            for position, kind in enumerate(kinds):
+                if kind == 'datetime' and _is_date_only(frame.iloc[:, position]):
+                    kinds[position] = 'date'
+            index_kind = _dtype_kind(frame.index.dtype)
+            if index_kind == 'datetime' and _is_date_only(frame.index):
+                index_kind = 'date'
+            self._kinds = _pd.Series(kinds, index=frame.columns, dtype=object), index_kind
+        return self._kinds
 
     def auto_fit(self, columns=None, scalar=None, flat=None, max_width=None, min_width=None,
-                 index=True, include_header=True):
+                 index=True, include_header=True, sample=None, random_state=None, font_metrics=None,
+                 executor=None, max_workers=None):
         """
         Attempt to auto fit column widths. ~Max length entry in column * scalar + flat.
         If columns not provided fits all columns.
 
+        With font_metrics, lengths are measured from glyph widths of each cell's font, size and boldness
+        instead of counting characters, in digits of the default font like Excel's column widths.
+        See xlframe.metrics. Numbers are measured as digits.
+
+        With sample, widths are estimated from that many randomly chosen rows instead of every row.
+        Integer, boolean, date and timedelta columns are still fit exactly, they only need a cheap pass.
+        How far each estimate could be below the exact fit is kept in column_width_errors and index_width_error.
+        Float columns are bounded by their largest magnitude, other columns only by max_width.
+
+        With executor, columns are fit in parallel. Results are the same as fitting one column at a time.
+        Process pools get numeric columns through shared memory where available (python 3.8+).
+
         :param columns: columns to autofit.
         :type columns: list-like.
-        :param scalar: to multiply by number of characters to get width. Default utils.Options.default_autofit_scalar.
+        :param scalar: to multiply by number of characters to get width. Default utils.Options.default_autofit_scalar,
+            or utils.Options.default_autofit_font_scalar with font_metrics.
         :type scalar: float.
         :param flat: flat amount to add to width. Default utils.Options.default_autofit_flat.
         :type flat: float.
@@ -483,56 +785,187 @@ class XlFrame:
         :type index: boolean.
         :param include_header: also consider width of column header when fitting. for index uses index.name.
         :type include_header: boolean.
+        :param sample: rows to estimate widths from. Fits exactly if unspecified or frame is no longer.
+        :type sample: int.
+        :param random_state: seed for choosing sampled rows.
+        :type random_state: int.
+        :param font_metrics: measure with font glyph widths. Default utils.Options.default_autofit_font_metrics.
+        :type font_metrics: boolean.
+        :param executor: 'thread', 'process', or an existing concurrent.futures.Executor (left running)
+            to fit columns in parallel. Fits one column at a time if unspecified.
+        :param max_workers: workers for a new thread or process pool. Defaults to the pool's default.
+        :type max_workers: int.
         :return: self
         """
         if columns is None:
             columns = self.columns
+        if font_metrics is None:
+            font_metrics = _utils.Options.default_autofit_font_metrics
         if flat is None:
             flat = _utils.Options.default_autofit_flat
         if scalar is None:
-            scalar = _utils.Options.default_autofit_scalar
+            options = _utils.Options
+            scalar = options.default_autofit_font_scalar if font_metrics else options.default_autofit_scalar
         if max_width is None:
             max_width = _utils.Options.default_autofit_max
         if min_width is None:
             min_width = _utils.Options.default_autofit_min
 
-        empty_dataframe = self.dataframe.empty
-        number_formats = self._styleframe.applymap(lambda style: self._named_styles[style].number_format)
-
-        def fit_column(column, formats):
-            dtype = column.dtype.name
-            if isinstance(formats, _pd.Series):
-                formats = formats.unique()
-            format_len = len(max(formats, key=len)) if not empty_dataframe else 0
-
-            if empty_dataframe:
-                width = 0
-            elif 'date' in dtype and _utils.NumberFormats.general not in formats:
-                width = format_len
-            elif 'time' in dtype and _utils.NumberFormats.general not in formats:
-                width = format_len + len(str(int(column.dt.days.max())))
-            elif 'float' in dtype:
-                if all('0.0' in e or e == '0' for e in formats):
-                    width = format_len + column.round().apply(str).str.len().max() - 2
-                else:
-                    width = column.apply('{:,.10f}'.format).str.rstrip('0').str.len().max()
-            else:
-                width = column.apply(str).str.len().max()
+        rows = None
+        if sample is not None and len(self) > sample:
+            rows = _widths.sample_positions(len(self), sample, random_state)
+        settings = _widths.FitSettings(
+            scalar=scalar, flat=flat, max_width=max_width, min_width=min_width, include_header=include_header,
+            font_metrics=font_metrics, rows=rows, empty=self.dataframe.empty,
+            # Excel column widths are in digits of the default font.
+            unit=_metrics.digit_width(_utils.Options.default_font_style, _utils.Options.default_font_size),
+        )
 
-            if include_header and column.name:
-                width = max(width, len(column.name) + 2)
+        fonts = dict()
+
+        def font(code):
+            # (name, size, bold) of style code
+            if code not in fonts:
+                style_font = self._named_styles.style(code).font
+                fonts[code] = (
+                    style_font.name or _utils.Options.default_font_style,
+                    style_font.sz or _utils.Options.default_font_size, bool(style_font.b)
+                )
+            return fonts[code]
+
+        def job(column, codes, header_code):
+            # Everything fit_column needs, without the frame.
+            distinct = _pd.unique(codes)
+            return (
+                column, codes, [self._named_styles.style(code).number_format for code in distinct],
+                {code: font(code) for code in distinct} if font_metrics else None, font(header_code)
+            )
 
-            return max(min(width * scalar + flat, max_width), min_width)
+        jobs = [
+            job(self.dataframe[column], self._styleframe[column].values, self._header_styles[column])
+            for column in columns
+        ]
+        if index:
+            jobs.append(job(self.index.to_series(), self._index_styles.values, self._header_styles.iat[0]))
 
-        for column in columns:
-            self._column_widths.at[column] = fit_column(self.dataframe[column], number_formats[column])
+        results = _widths.fit_columns(jobs, settings, executor=executor, max_workers=max_workers)
 
+        for column, (width, error) in zip(columns, results):
+            self._column_widths.at[column], self._column_width_errors.at[column] = width, error
+        if index:
+            self._index_width, self._index_width_error = results[-1]
+
+        return self
+
+    def auto_fit_rows(self, columns=None, scalar=None, flat=None, min_height=None, max_height=None,
+                      index=True, include_header=True):
+        """
+        Fit row heights to wrapped text. Only cells whose style has wrap_text are measured,
+        so columns without wrapping styles cost nothing.
+        Lines are counted from each cell's text, its column's width and its font size. Each row gets the height
+        of its tallest wrapped cell. Rows without wrapped cells keep their height.
+        Fit column widths first, rows are fit to the current widths.
+
+        :param columns: columns to consider.
+        :type columns: list-like.
+        :param scalar: width per character, as used by auto_fit. Default utils.Options.default_autofit_scalar.
+        :type scalar: float.
+        :param flat: width added to columns, as used by auto_fit. Default utils.Options.default_autofit_flat.
+        :type flat: float.
+        :param min_height: min allowed height. Default utils.Options.default_row_height.
+        :type min_height: float.
+        :param max_height: max allowed height. Default utils.Options.default_autofit_row_max.
+        :type max_height: float.
+        :param index: consider index as well.
+        :type index: boolean.
+        :param include_header: fit header height as well.
+        :type include_header: boolean.
+        :return: self
+        """
+        if columns is None:
+            columns = self.columns
+        if scalar is None:
+            scalar = _utils.Options.default_autofit_scalar
+        if flat is None:
+            flat = _utils.Options.default_autofit_flat
+        if min_height is None:
+            min_height = _utils.Options.default_row_height
+        if max_height is None:
+            max_height = _utils.Options.default_autofit_row_max
+
+        # Height of a line relative to font size.
+        spacing = _utils.Options.default_row_height / _utils.Options.default_font_size
+        wrapping = dict()
+
+        def font_size(code):
+            # Font size of style code, or None if it doesn't wrap.
+            if code not in wrapping:
+                style = self._named_styles.style(code)
+                wrapping[code] = (style.font.sz or _utils.Options.default_font_size) \
+                    if style.alignment.wrap_text else None
+            return wrapping[code]
+
+        def heights(values, codes, width):
+            # Height of each wrapped value, nan where not wrapped.
+            result = _np.full(len(codes), _np.nan)
+            sizes = {code: font_size(code) for code in _pd.unique(codes)}
+            sizes = {code: size for code, size in sizes.items() if size is not None}
+            if not sizes:
+                return result
+            wrapped = _np.isin(codes, list(sizes))
+            size = _pd.Series(codes[wrapped]).map(sizes).values.astype(float)
+            # Characters per line. Widths are characters * scalar + flat in the default font size.
+            capacity = _np.maximum((width - flat) / scalar * _utils.Options.default_font_size / size, 1)
+            result[wrapped] = _widths.wrapped_lines(_np.asarray(values)[wrapped], capacity) * size * spacing
+            return result
+
+        def fit(height):
+            return _np.round(_np.clip(height, min_height, max_height), 2)
+
+        tallest = _np.full(len(self), _np.nan)
+        header = [_np.nan]
+        for column in columns:
+            tallest = _np.fmax(tallest, heights(
+                self.dataframe[column].values, self._styleframe[column].values, self._column_widths[column]
+            ))
+            if include_header:
+                header = _np.fmax(header, heights(
+                    [column], _np.array([self._header_styles[column]]), self._column_widths[column]
+                ))
         if index:
-            index_formats = self._index_styles.apply(lambda style: self._named_styles[style].number_format)
-            self._index_width = fit_column(self.index.to_series(), index_formats)
+            tallest = _np.fmax(tallest, heights(self.index.values, self._index_styles.values, self._index_width))
+            if include_header and self.index.name is not None and len(self._header_styles):
+                header = _np.fmax(header, heights(
+                    [self.index.name], self._header_styles.values[:1], self._index_width
+                ))
+
+        rows = _np.flatnonzero(~_np.isnan(tallest))
+        if len(rows):
+            self._row_heights.iloc[rows] = fit(tallest[rows])
+        if not _np.isnan(header[0]):
+            self._header_height = float(fit(header[0]))
 
         return self
 
+    def _fit_for_export(self, auto_fit, index=True, include_header=True):
+        """
+        Apply to_excel's auto_fit argument.
+
+        :param auto_fit: Columns to autofit, True for all columns or dict of auto_fit kwargs.
+        :type auto_fit: list-like, boolean or dict.
+        :param index: Index is exported.
+        :type index: boolean.
+        :param include_header: Header is exported.
+        :type include_header: boolean.
+        :return: None
+        """
+        if auto_fit is None or auto_fit is False:
+            return
+        kwargs = dict(auto_fit) if isinstance(auto_fit, dict) else {'columns': None if auto_fit is True else auto_fit}
+        kwargs.setdefault('index', index)
+        kwargs.setdefault('include_header', include_header)
+        self.auto_fit(**kwargs)
+
     def format_as_table(self, table_style=None, table_name=None, row_stripes=True, col_stripes=None, **kwargs):
         """
         When exported format excel range as a table. Tables names must be unique within a workbook.
@@ -571,30 +1004,312 @@ class XlFrame:
         self._table_args = None
         return self
 
+    def add_conditional_format(self, rule, columns=None):
+        """
+        Add an Excel conditional format over the data cells of columns.
+        Excel applies it when the file is opened, so export writes the rule once however many cells it covers
+        and no styles are added to the frame.
+
+        Build rules with openpyxl.formatting.rule: ColorScaleRule, DataBarRule, IconSetRule, CellIsRule,
+        FormulaRule or Rule. Rules added first take priority.
+        Formulas are relative to the top left cell of the range. {cell}, {col} and {row} in a formula are replaced
+        with that cell, its column letter and its row number at export, e.g. FormulaRule(formula=['{cell}<0']).
+        Rules with placeholders are added separately for each run of adjacent columns.
+
+        :param rule: Conditional formatting rule.
+        :type rule: openpyxl.formatting.rule.Rule
+        :param columns: Columns to format. Default all columns.
+        :type columns: list-like
+        :return: self
+        """
+        if columns is not None:
+            if isinstance(columns, (str, int)):
+                columns = [columns]
+            columns = tuple(columns)
+            missing = [column for column in columns if column not in self.columns]
+            if missing:
+                raise KeyError('Columns {} not found.'.format(missing))
+        self._conditional_formats.append((rule, columns))
+        return self
+
+    def clear_conditional_formats(self):
+        """
+        Remove conditional formats.
+
+        :return: self
+        """
+        self._conditional_formats = []
+        return self
+
+    def _conditional_format_ranges(self, startcol=0, startrow=0, rows=None):
+        """
+        Conditional formats placed on a sheet.
+
+        :param startcol: Columns before the first data column.
+        :type startcol: int
+        :param startrow: Rows before the first data row.
+        :type startrow: int
+        :param rows: Data rows to cover. Default rows in frame.
+        :type rows: int
+        :return: (copy of rule, space separated cell ranges) in priority order.
+        :rtype: list of tuple
+        """
+        rows = len(self.index) if rows is None else rows
+        ranges = []
+        if not rows:
+            return ranges
+        for rule, columns in self._conditional_formats:
+            if columns is None:
+                positions = _np.arange(len(self.columns))
+            else:
+                # Columns sliced away are skipped.
+                positions = _np.unique(self.columns.get_indexer(list(columns)))
+                positions = positions[positions >= 0]
+            if not len(positions):
+                continue
+
+            blocks = _np.split(positions, _np.flatnonzero(_np.diff(positions) != 1) + 1)
+            refs = []
+            for block in blocks:
+                first, last = _get_column_letter(startcol + block[0] + 1), _get_column_letter(startcol + block[-1] + 1)
+                refs.append((first, '{}{}:{}{}'.format(first, startrow + 1, last, startrow + rows)))
+
+            formulas = list(rule.formula or ())
+            if any(token in formula for formula in formulas for token in ('{cell}', '{col}', '{row}')):
+                for letter, ref in refs:
+                    copy = _copy(rule)
+                    row = str(startrow + 1)
+                    copy.formula = [
+                        formula.replace('{cell}', letter + row).replace('{col}', letter).replace('{row}', row)
+                        for formula in formulas
+                    ]
+                    ranges.append((copy, ref))
+            else:
+                # Priority and differential style index are set on the copy when added.
+                ranges.append((_copy(rule), ' '.join(ref for _, ref in refs)))
+        return ranges
+
+    def _add_conditional_formats(self, sheet, startcol=0, startrow=0, rows=None):
+        """
+        Add conditional formats to openpyxl sheet. See _conditional_format_ranges.
+
+        :return: None
+        """
+        for rule, ref in self._conditional_format_ranges(startcol=startcol, startrow=startrow, rows=rows):
+            sheet.conditional_formatting.add(ref, rule)
+
     def row_stripes(self, fill_color='D9D9D9'):
         """
-        Solid fill every other row with fill_color.
+        Solid fill every other row with fill_color, starting from the first.
+        Added as a conditional format, so it costs the same however many rows there are
+        and is drawn over the fills of cell styles. See add_conditional_format.
 
         :param fill_color: Color to fill. Hex, rgb tuple or or openpyxl.styles.Color.
         :type fill_color: str, tuple or openpyxl.styles.Color
         :return: self
         """
-        _filler['fill_color'] = fill_color
-        self.styles[::2, :] = _filler
-        return self
+        return self.add_conditional_format(_stripes('ROW()-{row}', fill_color))
 
     def col_stripes(self, fill_color='D9D9D9'):
         """
-        Solid fill every other column with fill_color.
+        Solid fill every other column with fill_color, starting from the first.
+        Added as a conditional format, so it costs the same however many rows there are
+        and is drawn over the fills of cell styles. See add_conditional_format.
 
         :param fill_color: Color to fill. Hex, rgb tuple or or openpyxl.styles.Color.
         :type fill_color: str, tuple or openpyxl.styles.Color
         :return: self
         """
-        _filler['fill_color'] = fill_color
-        self.styles[:, ::2] = _filler
+        return self.add_conditional_format(_stripes('COLUMN()-COLUMN(${col}$1)', fill_color))
+
+    def style_where(self, cond, style=None, columns=None):
+        """
+        Style cells where cond is True. Styles replace the cells' styles, dicts change them same as styles[...] = dict.
+
+        Several rules can be given at once as a list of (cond, style) or (cond, style, columns), highest priority first.
+        Cells end up as if the rules they match were applied one at a time from lowest priority to highest,
+        so a higher priority style replaces lower ones and its changes take precedence over theirs.
+        Rules are resolved in one pass, working out each distinct combination of existing style and matched rules once.
+
+        :param cond: Boolean DataFrame aligned on index and columns, boolean Series or array over rows,
+            2D boolean array, or callable taking the dataframe and returning one of those.
+            2D arrays are shaped like the dataframe, or have one column per entry of columns.
+            List of rules if style is unspecified.
+        :param style: Style or changes to apply.
+        :type style: xlframe.Style, openpyxl.styles.NamedStyle, str or dict
+        :param columns: Columns to style. Default all columns. DataFrame conditions style their own columns.
+            A 2D array condition shaped like the dataframe is read at these columns.
+        :type columns: list-like
+        :return: self
+        """
+        if style is not None:
+            rules = [(cond, style, columns)]
+        else:
+            rules = [tuple(rule) + (columns,) * (3 - len(rule)) for rule in cond]
+
+        registry = self._named_styles
+        cache = dict()
+        # Codes can only hold so many rules as bits. Apply in groups, lowest priority first.
+        rules = rules[::-1]
+        for start in range(0, len(rules), _RULE_BITS):
+            group = rules[start:start + _RULE_BITS]
+            matched = _np.zeros(self._styleframe.shape, dtype=_np.int64)
+            for bit, (rule_cond, _, rule_columns) in enumerate(group):
+                matched |= self._rule_mask(rule_cond, rule_columns).astype(_np.int64) << bit
+            styles = [
+                tuple(rule_style.items()) if isinstance(rule_style, dict) else self._style_code(rule_style)
+                for _, rule_style, _ in group
+            ]
+
+            def resolve(code, bits):
+                for bit, rule_style in enumerate(styles):
+                    if bits >> bit & 1:
+                        if isinstance(rule_style, tuple):
+                            code = registry.code(self._style_edit(registry.name(code), rule_style, cache))
+                        else:
+                            code = rule_style
+                return code
+
+            self._remap_codes(matched, resolve)
         return self
 
+    def background_gradient(self, columns=None, colors=('F8696B', 'FFEB84', '63BE7B'), buckets=10, axis=0,
+                            vmin=None, vmax=None):
+        """
+        Solid fill cells with colors from a gradient by value, the lowest values getting the first color.
+        Values are binned into buckets evenly spaced from vmin to vmax and each bucket is given one color,
+        so at most buckets styles are added for each style already in the cells however many rows there are.
+        Missing and infinite values are left as they are.
+
+        :param columns: Columns to fill. Default all numeric columns.
+        :type columns: list-like
+        :param colors: Hex colors the gradient runs through, evenly spaced.
+        :type colors: list of str
+        :param buckets: Number of colors values are binned into.
+        :type buckets: int
+        :param axis: 0 to scale each column separately, 1 each row, None all columns together.
+        :type axis: int or None
+        :param vmin: Value of the first color. Default the minimum. Lower values get the first color.
+        :type vmin: float
+        :param vmax: Value of the last color. Default the maximum. Higher values get the last color.
+        :type vmax: float
+        :return: self
+        """
+        if buckets < 1:
+            raise ValueError('buckets must be at least 1.')
+        if columns is None:
+            columns = self.dataframe.select_dtypes(include='number').columns
+        elif isinstance(columns, (str, int)):
+            columns = [columns]
+        positions = self.columns.get_indexer(columns)
+        if (positions < 0).any():
+            raise KeyError('Columns {} not found.'.format(list(_np.asarray(columns)[positions < 0])))
+
+        values = self.dataframe.iloc[:, positions].values.astype(float)
+        valid = _np.isfinite(values)
+        lower = _np.where(valid, values, _np.inf).min(axis=axis, keepdims=True, initial=_np.inf) \
+            if vmin is None else vmin
+        upper = _np.where(valid, values, -_np.inf).max(axis=axis, keepdims=True, initial=-_np.inf) \
+            if vmax is None else vmax
+        span = _np.where(valid, upper - lower, 1)
+        with _np.errstate(divide='ignore', invalid='ignore'):
+            scaled = _np.where(valid & (span != 0), (values - lower) / span, 0.5)
+        bins = _np.clip(_np.floor(scaled * buckets), 0, buckets - 1).astype(_np.int64)
+
+        labels = _np.zeros(self._styleframe.shape, dtype=_np.int64)
+        labels[:, positions] = _np.where(valid, bins + 1, 0)
+
+        fills = [
+            (('fill_pattern', _utils.FillPattern.solid), ('fill_color', color))
+            for color in _gradient(colors, buckets)
+        ]
+        registry = self._named_styles
+        cache = dict()
+
+        def resolve(code, label):
+            return registry.code(self._style_edit(registry.name(code), fills[label - 1], cache))
+
+        self._remap_codes(labels, resolve)
+        return self
+
+    def _remap_codes(self, labels, resolve):
+        """
+        Replace the style codes of labelled cells in bulk. Each distinct (code, label) is resolved once.
+
+        :param labels: Label for each cell. Cells labelled 0 are left as they are.
+        :type labels: 2D numpy.ndarray of int64 shaped like the dataframe
+        :param resolve: Called with (code, label), returns the cell's new code.
+        :type resolve: callable
+        :return: None
+        """
+        positions = _np.flatnonzero(labels.any(axis=0))
+        if not len(positions):
+            return
+        labels = labels[:, positions]
+        if self._sparse:
+            codes = self._styleframe.take(slice(None), positions)
+        else:
+            codes = self._styleframe.values[:, positions].copy()
+
+        cells = labels != 0
+        distinct, label_ids = _np.unique(labels[cells], return_inverse=True)
+        keys, inverse = _np.unique(codes[cells].astype(_np.int64) * len(distinct) + label_ids, return_inverse=True)
+        results = _np.array(
+            [resolve(key // len(distinct), int(distinct[key % len(distinct)])) for key in keys], dtype=_CODE_DTYPE
+        )
+        codes[cells] = results[inverse]
+
+        if self._sparse:
+            for i, position in enumerate(positions):
+                rows = _np.flatnonzero(cells[:, i])
+                self._styleframe.assign(rows, [position], codes[rows, i])
+        else:
+            self._styleframe.iloc[:, positions] = codes
+
+    def _rule_mask(self, cond, columns=None):
+        """
+        Cells a style_where condition selects.
+
+        :param cond: Condition. See style_where.
+        :param columns: Columns to select. Default all columns.
+        :type columns: list-like
+        :return: 2D numpy.ndarray of bool shaped like the dataframe.
+        """
+        if callable(cond):
+            cond = cond(self.dataframe)
+        positions = _np.arange(len(self.columns))
+        if columns is not None:
+            positions = self.columns.get_indexer(columns)
+            if (positions < 0).any():
+                raise KeyError('Columns {} not found.'.format(list(_np.asarray(columns)[positions < 0])))
+
+        mask = _np.zeros(self._styleframe.shape, dtype=bool)
+        if isinstance(cond, _pd.DataFrame):
+            if not cond.index.equals(self.index):
+                cond = cond.reindex(index=self.index)
+            cond_positions = self.columns.get_indexer(cond.columns)
+            keep = _np.isin(cond_positions, positions)
+            mask[:, cond_positions[keep]] = cond.iloc[:, keep].fillna(False).values.astype(bool)
+            return mask
+
+        if isinstance(cond, _pd.Series):
+            if not cond.index.equals(self.index):
+                cond = cond.reindex(index=self.index)
+            cond = cond.fillna(False).values
+        cond = _np.asarray(cond, dtype=bool)
+        if cond.shape == mask.shape:
+            cond = cond[:, positions]
+        elif cond.shape == (len(self.index),):
+            cond = cond[:, None]
+        elif cond.shape != (len(self.index), len(positions)):
+            raise ValueError(
+                'Condition of shape {} does not match rows {}, dataframe {} or selected columns {}.'.format(
+                    cond.shape, (len(self.index),), mask.shape, (len(self.index), len(positions))
+                )
+            )
+        mask[:, positions] = cond
+        return mask
+
     def get_column_letter(self, column, startcol=0):
         """
         Get excel column letter for a given frame column.
@@ -637,6 +1352,34 @@ class XlFrame:
 
         return self._style_parser(style)
 
+    def compact_styles(self, merge=True):
+        """
+        Drop styles no cell, index or header uses. Builtin styles are kept.
+        With merge, identical styles numbered from the same name ('Style', 'Style[1]', 'Style[2]' ...)
+        are replaced by the first of them.
+
+        Export already leaves out unused and merged styles. Compacting also frees them and speeds up later edits.
+
+        :param merge: Merge identical styles.
+        :type merge: boolean
+        :return: self
+        """
+        registry = self._named_styles
+        used = self._used_codes()
+        used[:len(self.builtins)] = True
+        canonical = self._canonical_codes(used) if merge else _np.arange(len(registry), dtype=_CODE_DTYPE)
+        keep = used & (canonical == _np.arange(len(registry)))
+        lookup = (_np.cumsum(keep) - 1).astype(_CODE_DTYPE)[canonical]
+
+        self._named_styles = _StyleRegistry(registry.style(code) for code in _np.flatnonzero(keep))
+        if self._sparse:
+            self._styleframe.remap(slice(None), slice(None), lambda codes: lookup[codes])
+        else:
+            self._styleframe.iloc[:, :] = lookup[self._styleframe.values]
+        self._index_styles[:] = lookup[self._index_styles.values]
+        self._header_styles[:] = lookup[self._header_styles.values]
+        return self
+
     def _style_parser(self, style):
         """
         Sort out different acceptable style arguments.
@@ -661,6 +1404,16 @@ class XlFrame:
         self._add_style(style)
         return style.name
 
+    def _style_code(self, style):
+        """
+        Sort out style argument and get its code.
+
+        :param style: xlframe.Style, openpyxl.styles.NamedStyle or str
+        :return: Style code
+        :rtype: numpy.int32
+        """
+        return self._named_styles.code(self._style_parser(style))
+
     def _add_style(self, style):
         """
         Add style to appropriate containers.
@@ -668,8 +1421,7 @@ class XlFrame:
         :param style: openpyxl.style.NamedStyle
         :return: None
         """
-        self.named_styles[style.name] = style
-        self._named_styles[style.name] = style
+        self._named_styles.add(style)
 
     def _style_editor(self, idxr, source, changes):
         """
@@ -684,15 +1436,25 @@ class XlFrame:
         :rtype: List of strings
         """
         cache = dict()
-        section = source[idxr]
         changes = tuple(changes.items())
+        registry = self._named_styles
+
+        def edit(code):
+            return registry.code(self._style_edit(registry.name(code), changes=changes, cache=cache))
 
-        if isinstance(section, _pd.DataFrame):
-            source[idxr] = section.applymap(lambda style: self._style_edit(style, changes=changes, cache=cache))
-        elif isinstance(section, _pd.Series):
-            source[idxr] = section.apply(self._style_edit, changes=changes, cache=cache)
+        if isinstance(source, _sparse.SparseFrame):
+            source, idxr = source.loc, (slice(None), idxr)
+        if isinstance(source, _sparse.SparseIndexer):
+            # Only edit the stored defaults and overrides.
+            source.remap(idxr, lambda codes: registry.remap(codes, edit))
+            return [style_name for _, style_name in cache.items()]
+
+        section = source[idxr]
+        if isinstance(section, (_pd.DataFrame, _pd.Series)):
+            # Edit each distinct style once then remap the whole section.
+            source[idxr] = registry.remap(section.values, edit)
         else:
-            source[idxr] = self._style_edit(section, changes=changes, cache=cache)
+            source[idxr] = edit(section)
         return [style_name for _, style_name in cache.items()]
 
     def _style_edit(self, style_name, changes, cache=None):
@@ -738,39 +1500,59 @@ class XlFrame:
                 'Cannot use name "{}" again.'.format(s.name)
             )
 
+        named_style = s.named_style
+        existing = self._equivalent_name(named_style, style_name)
+        if existing is None:
+            self._rename(named_style)
+            self.add_style(named_style)
         if cache is not None:
-            cache[(style_name, changes)] = self._rename(s)
+            cache[(style_name, changes)] = existing or named_style.name
+        return existing or named_style.name
 
-        return self.add_style(s)
+    def _equivalent_name(self, style, style_name):
+        """
+        Find a registered style that formats cells the same as style, to reuse instead of adding a duplicate.
+        Only style_name or styles numbered from the same name are reused.
 
-    def _rename(self, style, named_styles=None):
+        :param style: Edited style.
+        :type style: openpyxl.styles.NamedStyle
+        :param style_name: Name of the style that was edited.
+        :type style_name: str
+        :return: Name of equivalent style or None
+        :rtype: str
+        """
+        base_name = self._find_name_num(style_name)[0]
+        names = [self._named_styles.name(code) for code in self._named_styles.equivalent(style)]
+        if style_name in names:
+            return style_name
+        for name in names:
+            if self._find_name_num(name)[0] == base_name:
+                return name
+        return None
+
+    def _rename(self, style, named_styles=None, counter=None):
         """
-        Give styles a new (numbered) name. Finds next available name.
+        Give styles a new (numbered) name. Numbered after the highest number already used with the name.
 
         :param style: Style to rename.
         :type style: openpyxl.style.NamedStyle or xlframe.Style
         :param named_styles: Optional dict of existing styles. Uses frames available styles if unspecified.
+        :param counter: Numbers used in named_styles. Keep one per named_styles when renaming repeatedly,
+            built from named_styles if unspecified.
+        :type counter: registry.NameCounter
         :return: New name
         :rtype: str
         """
         if named_styles is None:
-            named_styles = self._named_styles
-        style_name, style_num = self._find_name_num(style.name)
-
-        for i in _count(style_num + 1):
-            new_name = '{}[{}]'.format(style_name, i)
-            if new_name not in named_styles:
-                style.name = new_name
-                return new_name
+            named_styles, counter = self._named_styles, self._named_styles.counter
+        elif counter is None:
+            counter = _NameCounter(named_styles)
+        style.name = counter.next_name(style.name, named_styles)
+        return style.name
 
     @staticmethod
     def _find_name_num(style_name):
-        if style_name[-1] != ']':
-            return style_name, 0
-        try:
-            return style_name[:style_name.rindex('[')], int(style_name[style_name.rindex('[') + 1:-1])
-        except ValueError:  # substring not found or invalid input to int() found.
-            return style_name, 0
+        return _split_name(style_name)
 
     def _get_range_as_str(self, row_index=None, columns=None, startcol=0, startrow=0, index=False):
         """
@@ -817,21 +1599,17 @@ class XlFrame:
 
     def _style_eq(self, style1, style2):
         """
-        Check if 2 styles are equal.
+        Check if 2 styles are equal. Same name and same fingerprint, see registry.fingerprint.
 
-        :param style1:
-        :param style2:
-        :return:
+        :param style1: Style name or style.
+        :param style2: Style name or style.
+        :return: bool
         """
-        if isinstance(style1, str):
-            style1 = self._named_styles[style1]
-        if isinstance(style2, str):
-            style2 = self._named_styles[style2]
         if isinstance(style1, _Style):
-            return style1 == style2
+            style1 = style1.named_style
         if isinstance(style2, _Style):
-            return style2 == style1
-        return hash(style1) == hash(style2)
+            style2 = style2.named_style
+        return self._named_styles.same(style1, style2)
 
     def __getitem__(self, item):
         return self.dataframe.__getitem__(item)
@@ -839,8 +1617,7 @@ class XlFrame:
     def __setitem__(self, key, style):
         if isinstance(style, dict):
             return self._style_editor(key, self._styleframe, style)
-        style = self._style_parser(style)
-        return self._styleframe.__setitem__(key, style)
+        return self._styleframe.__setitem__(key, self._style_code(style))
 
     def __delitem__(self, key):
         raise NotImplementedError
@@ -849,9 +1626,9 @@ class XlFrame:
         s = '{}\n\n{}\n\n{}\n\n{}\n\n{}\n\n{}'
         return s.format(
             str(self.dataframe),
-            str(self._styleframe),
-            str(self._header_styles),
-            str(self._index_styles),
+            str(self.styles),
+            str(self._named_styles.decode(self._header_styles)),
+            str(self._named_styles.decode(self._index_styles)),
             str(self._column_widths),
             str(self._row_heights),
         )
@@ -862,6 +1639,19 @@ class XlFrame:
     def __iter__(self):
         return iter(self._styleframe)
 
+    @property
+    def sparse(self):
+        return self._sparse
+
+    @property
+    def named_styles(self):
+        """
+        Styles added to frame. Excludes builtins.
+
+        :return: dict of name: openpyxl.styles.NamedStyle
+        """
+        return {style.name: style for style in self._named_styles.styles[len(self.builtins):]}
+
     @property
     def styles(self):
         return self._styleframe.style_loc
@@ -942,6 +1732,24 @@ class XlFrame:
     def index_width(self, value):
         self._index_width = float(value)
 
+    @property
+    def column_width_errors(self):
+        """
+        Most each column's width could be below its exact fit, from the last sampled auto_fit. 0 when fit exactly.
+
+        :return: pandas.Series
+        """
+        return self._column_width_errors
+
+    @property
+    def index_width_error(self):
+        """
+        Most index width could be below its exact fit, from the last sampled auto_fit. 0 when fit exactly.
+
+        :return: float
+        """
+        return self._index_width_error
+
     @property
     def hyperlinks(self):
         if self._hyperlinks is None:
@@ -949,21 +1757,34 @@ class XlFrame:
         return self._hyperlinks
 
     @staticmethod
-    def ExcelWriter(path, load_existing=False, **kwargs):
+    def ExcelWriter(path, load_existing=False, write_only=False, **kwargs):
         """
-        See pandas.ExcelWriter. Engine will be set to 'openpyxl'.
+        See pandas.ExcelWriter. Engine will be set to 'openpyxl' unless engine='xlsxwriter' is given.
 
         :param path: Full path for workbook.
         :type path: String.
         :param load_existing: Load existing workbook into excel_writer if one exists at path.
         :type load_existing: Boolean.
+        :param write_only: Use a write only workbook. XlFrames exported to it are written in a single pass.
+            Sheets can only be added, not edited, and cannot be combined with load_existing.
+        :type write_only: Boolean.
         :return: pandas.ExcelWriter
         """
-        kwargs['engine'] = 'openpyxl'
+        if load_existing and write_only:
+            raise ValueError('Cannot load existing workbook as write only.')
+
+        if kwargs.get('engine') == 'xlsxwriter':
+            if load_existing or write_only:
+                raise ValueError('load_existing and write_only are only available with openpyxl.')
+        else:
+            kwargs['engine'] = 'openpyxl'
         kwargs['date_format'] = kwargs.get('date_format', _utils.Options.default_date_format)
         kwargs['datetime_format'] = kwargs.get('datetime_format', _utils.Options.default_datetime_format)
         excel_writer = _pd.ExcelWriter(path, **kwargs)
 
+        if write_only:
+            excel_writer.book = _Workbook(write_only=True)
+
         if load_existing and _os.path.isfile(path):
             # load book
             vba = _os.path.splitext(path)[1] == '.xlsm'
@@ -981,9 +1802,10 @@ class XlFrame:
             'header_height', 'index_width',
         )
         attrs_pd = (
-            'dataframe', '_styleframe',
-            '_index_styles', '_header_styles',
-            '_row_heights', '_column_widths'
+            'dataframe', '_column_widths'
+        )
+        attrs_styles = (
+            '_index_styles', '_header_styles'
         )
         shared_styles = set(self.named_styles) & set(other.named_styles)
         tbl = other._table_args is None if self._table_args is None else self._table_args == other._table_args
@@ -991,10 +1813,81 @@ class XlFrame:
 
         return tbl and hypr \
                and all(getattr(self, attr) == getattr(other, attr) for attr in attrs) \
+               and self.styles[:, :].equals(other.styles[:, :]) \
+               and self.row_heights[:].equals(other.row_heights[:]) \
                and all(getattr(self, attr).equals(getattr(other, attr)) for attr in attrs_pd) \
+               and all(self._named_styles.decode(getattr(self, attr)).equals(
+                   other._named_styles.decode(getattr(other, attr))) for attr in attrs_styles) \
                and all(self._style_eq(self.named_styles[style], other.named_styles[style]) for style in shared_styles)
 
 
+def _dtype_kind(dtype):
+    """
+    Kind of type based style a dtype gets. Datetimes may also be dates, see _is_date_only.
+
+    :param dtype: Column or index dtype.
+    :return: 'datetime', 'timedelta', 'number' or None
+    :rtype: str
+    """
+    if _is_datetime64_any_dtype(dtype):
+        return 'datetime'
+    if _is_timedelta64_dtype(dtype):
+        return 'timedelta'
+    if issubclass(getattr(dtype, 'type', object), _np.number):
+        return 'number'
+    return None
+
+
+def _is_date_only(values):
+    """
+    Check no entries of datetime values have a time component.
+    Works on the integer ticks of the values so nothing is converted to python times.
+
+    :param values: Datetime column or index.
+    :type values: pandas.Series or pandas.DatetimeIndex
+    :return: boolean
+    """
+    if getattr(values.dtype, 'tz', None) is not None:
+        # Wall times in the values' time zone.
+        values = (values.dt if isinstance(values, _pd.Series) else values).tz_localize(None)
+    values = _np.asarray(values)
+    unit, count = _np.datetime_data(values.dtype)
+    day = _np.timedelta64(1, 'D') // _np.timedelta64(count, unit)
+    ticks = values.view(_np.int64)
+    return bool(((ticks % day == 0) | (ticks == _NAT)).all())
+
+
+def _gradient(colors, steps):
+    """
+    Hex colors evenly spaced along a gradient.
+
+    :param colors: Hex colors the gradient runs through, evenly spaced.
+    :type colors: list of str
+    :param steps: Number of colors.
+    :type steps: int
+    :return: list of str
+    """
+    stops = _np.array([[int(color.lstrip('#')[-6:][i:i + 2], 16) for i in (0, 2, 4)] for color in colors], dtype=float)
+    points = _np.linspace(0, 1, steps) if steps > 1 else _np.array([0.5])
+    rgb = _np.column_stack([_np.interp(points, _np.linspace(0, 1, len(stops)), stops[:, i]) for i in range(3)])
+    return ['{:02X}{:02X}{:02X}'.format(*channels) for channels in _np.rint(rgb).astype(int)]
+
+
+def _stripes(offset, fill_color):
+    """
+    Conditional format filling where offset is even.
+
+    :param offset: Excel formula for the offset of a cell from the first stripe.
+    :type offset: str
+    :param fill_color: Color to fill. Hex, rgb tuple or or openpyxl.styles.Color.
+    :return: openpyxl.formatting.rule.Rule
+    """
+    color = _Style('Stripes', fill_color=fill_color).fill_color
+    return _FormulaRule(
+        formula=['MOD({},2)=0'.format(offset)], fill=_PatternFill(fill_type='solid', fgColor=color, bgColor=color)
+    )
+
+
 class _StyleIndexer:
     def __init__(self, styler, indexer):
         self.indexer = indexer
@@ -1008,20 +1901,19 @@ class _StyleIndexer:
         if isinstance(style, dict):
             self.styler._style_editor(key, self.indexer, style)
         else:
-            style = self.styler._style_parser(style)
-            self.indexer.__setitem__(key, style)
+            self.indexer.__setitem__(key, self.styler._style_code(style))
 
     def __getitem__(self, item):
-        return self.indexer.__getitem__(item)
+        return self.styler._named_styles.decode(self.indexer.__getitem__(item))
 
     def __getattr__(self, item):
         return getattr(self.indexer, item)
 
     def __str__(self):
-        return str(self.indexer.obj)
+        return str(self.styler._named_styles.decode(self.indexer.obj))
 
     def __repr__(self):
-        return repr(self.indexer.obj)
+        return repr(self.styler._named_styles.decode(self.indexer.obj))
 
 
 class _SeriesIndexer:
@@ -1051,20 +1943,19 @@ class _SeriesIndexer:
         if isinstance(style, dict):
             self.styler._style_editor(key, self.series, style)
         else:
-            style = self.styler._style_parser(style)
-            self.series.__setitem__(key, style)
+            self.series.__setitem__(key, self.styler._style_code(style))
 
     def __getitem__(self, item):
-        return self.series.__getitem__(item)
+        return self.styler._named_styles.decode(self.series.__getitem__(item))
 
     def __getattr__(self, item):
-        return getattr(self.series, item)
+        return getattr(self.styler._named_styles.decode(self.series), item)
 
     def __str__(self):
-        return str(self.series)
+        return str(self.styler._named_styles.decode(self.series))
 
     def __repr__(self):
-        return repr(self.series)
+        return repr(self.styler._named_styles.decode(self.series))
 
 
 class _Slicer:
@@ -1111,8 +2002,9 @@ class _Slicer:
         """
         idxr = _Slicer._idxr_for_frame(idxr)
 
-        frame = XlFrame(getattr(source.dataframe, idx_by).__getitem__(idxr), use_default_formats=False)
-        frame.named_styles = source.named_styles.copy()
+        frame = XlFrame(
+            getattr(source.dataframe, idx_by).__getitem__(idxr), use_default_formats=False, sparse=source.sparse
+        )
         frame._named_styles = source._named_styles.copy()
 
         frame._styleframe.loc[:, :] = getattr(source._styleframe, idx_by).__getitem__(idxr).values
@@ -1122,14 +2014,17 @@ class _Slicer:
 
         frame._row_heights.loc[:] = getattr(source._row_heights, idx_by)[idxr[0]].values
         frame._column_widths.loc[:] = getattr(source._column_widths, idx_by)[idxr[1]].values
+        frame._column_width_errors.loc[:] = getattr(source._column_width_errors, idx_by)[idxr[1]].values
 
         frame._index_width = source._index_width
+        frame._index_width_error = source._index_width_error
         frame._header_height = source._header_height
 
         frame._defaults_used = source._defaults_used
 
         if source._table_args is not None:
             frame._table_args = source._table_args.copy()
+        frame._conditional_formats = list(source._conditional_formats)
 
         if source._hyperlinks is not None:
             links = getattr(source._hyperlinks, idx_by)[idxr[0], :]
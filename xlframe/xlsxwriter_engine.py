@@ -0,0 +1,424 @@
+from collections import namedtuple as _namedtuple
+
+from openpyxl.styles import Alignment as _Alignment, Border as _Border, Color as _Color, Font as _Font, \
+    PatternFill as _PatternFill, Protection as _Protection
+from openpyxl.styles.colors import COLOR_INDEX as _COLOR_INDEX
+from openpyxl.utils import get_column_letter as _get_column_letter
+from openpyxl.worksheet.hyperlink import Hyperlink as _Hyperlink
+
+from . import streaming as _streaming
+
+__all__ = []
+
+# openpyxl style names to xlsxwriter indices.
+BORDERS = {
+    None: 0, 'thin': 1, 'medium': 2, 'dashed': 3, 'dotted': 4, 'thick': 5, 'double': 6, 'hair': 7,
+    'mediumDashed': 8, 'dashDot': 9, 'mediumDashDot': 10, 'dashDotDot': 11, 'mediumDashDotDot': 12,
+    'slantDashDot': 13,
+}
+PATTERNS = {
+    None: 0, 'none': 0, 'solid': 1, 'mediumGray': 2, 'darkGray': 3, 'lightGray': 4, 'darkHorizontal': 5,
+    'darkVertical': 6, 'darkDown': 7, 'darkUp': 8, 'darkGrid': 9, 'darkTrellis': 10, 'lightHorizontal': 11,
+    'lightVertical': 12, 'lightDown': 13, 'lightUp': 14, 'lightGrid': 15, 'lightTrellis': 16, 'gray125': 17,
+    'gray0625': 18,
+}
+UNDERLINES = {'single': 1, 'double': 2, 'singleAccounting': 33, 'doubleAccounting': 34}
+HORIZONTAL = {'centerContinuous': 'center_across'}
+VERTICAL = {'center': 'vcenter', 'justify': 'vjustify', 'distributed': 'vdistributed'}
+# openpyxl conditional formatting names to xlsxwriter criteria and styles.
+OPERATORS = {
+    'between': 'between', 'notBetween': 'not between', 'equal': '==', 'notEqual': '!=', 'greaterThan': '>',
+    'lessThan': '<', 'greaterThanOrEqual': '>=', 'lessThanOrEqual': '<=',
+}
+TEXT_RULES = {
+    'containsText': 'containing', 'notContainsText': 'not containing', 'beginsWith': 'begins with',
+    'endsWith': 'ends with',
+}
+VALUE_RULES = {
+    'duplicateValues': 'duplicate', 'uniqueValues': 'unique', 'containsBlanks': 'blanks',
+    'notContainsBlanks': 'no_blanks', 'containsErrors': 'errors', 'notContainsErrors': 'no_errors',
+}
+ICON_STYLES = {
+    '3Arrows': '3_arrows', '3ArrowsGray': '3_arrows_gray', '3Flags': '3_flags', '3TrafficLights1': '3_traffic_lights',
+    '3TrafficLights2': '3_traffic_lights_rimmed', '3Signs': '3_signs', '3Symbols': '3_symbols_circled',
+    '3Symbols2': '3_symbols', '4Arrows': '4_arrows', '4ArrowsGray': '4_arrows_gray', '4RedToBlack': '4_red_to_black',
+    '4Rating': '4_ratings', '4TrafficLights': '4_traffic_lights', '5Arrows': '5_arrows', '5ArrowsGray': '5_arrows_gray',
+    '5Rating': '5_ratings', '5Quarters': '5_quarters',
+}
+
+# Stand in for a NamedStyle built from a conditional format's differential style.
+_Formats = _namedtuple('_Formats', 'font fill border alignment number_format protection')
+
+
+def write_sheet(xf, excel_writer, sheet_name, *, protect_sheet=False, right_to_left=False, columns_to_hide=None,
+                add_filters=False, auto_fit=None, index=True, header=True, startcol=0, startrow=0,
+                index_label=None, na_rep='', float_format=None, inf_rep='inf', freeze_panes=None):
+    """
+    Export XlFrame to a new sheet of an xlsxwriter workbook.
+    Values and formats are written a row at a time so works with constant_memory workbooks.
+    Tables are not available in constant_memory mode.
+
+    :param xf: XlFrame to export.
+    :type xf: xlframe.XlFrame
+    :param excel_writer: pandas ExcelWriter using the xlsxwriter engine.
+    :type excel_writer: pandas.ExcelWriter
+    :param sheet_name: Name for new sheet.
+    :type sheet_name: str
+    :return: xlsxwriter worksheet
+    """
+    book = excel_writer.book
+    if sheet_name in excel_writer.sheets:
+        raise ValueError('Sheet "{}" already exists. xlsxwriter sheets cannot be edited.'.format(sheet_name))
+    if xf._table_args and book.constant_memory:
+        raise ValueError('Cannot format as table in constant_memory mode.')
+    if index_label is None:
+        index_label = xf.index.name
+
+    sheet = excel_writer.sheets[sheet_name] = book.add_worksheet(sheet_name)
+
+    xf._fit_for_export(auto_fit, index=index, include_header=bool(header))
+
+    formats = dict()
+
+    def cell_format(code):
+        # Translate each distinct style once.
+        try:
+            return formats[code]
+        except KeyError:
+            formats[code] = book.add_format(format_properties(xf._named_styles.style(code)))
+            return formats[code]
+
+    if right_to_left:
+        sheet.right_to_left()
+
+    datacol = startcol + 1 if index else startcol
+
+    # column dimensions
+    hidden = set()
+    if columns_to_hide:
+        if isinstance(columns_to_hide, (str, int)):
+            columns_to_hide = [columns_to_hide]
+        hidden = {xf.get_column_letter(column, startcol=datacol) for column in columns_to_hide}
+    widths = list(xf.column_widths.values)
+    if index:
+        widths.insert(0, xf.index_width)
+    for col_index, width in enumerate(widths, startcol):
+        options = {'hidden': True} if _get_column_letter(col_index + 1) in hidden else None
+        sheet.set_column(col_index, col_index, column_width(width), None, options)
+
+    if freeze_panes is not None:
+        sheet.freeze_panes(*freeze_panes)
+
+    if protect_sheet:
+        # Same protection openpyxl enables. Filters left usable.
+        sheet.protect('', {'objects': True, 'scenarios': True, 'autofilter': True})
+
+    header_values, header_styles = _streaming.header_cells(xf, index=index, index_label=index_label)
+    if header:
+        sheet.set_row(startrow, xf.header_height)
+        for col_index, (value, style) in enumerate(zip(header_values, header_styles), startcol):
+            write_cell(sheet, startrow, col_index, value, cell_format(style))
+
+    datarow = startrow + 1 if header else startrow
+    values, styles, links = _streaming.body_columns(
+        xf, index=index, index_label=index_label, na_rep=na_rep, float_format=float_format, inf_rep=inf_rep
+    )
+    values = [column.tolist() for column in values]
+
+    heights = xf.row_heights.values
+    for row_index, row in enumerate(zip(*values)):
+        sheet.set_row(datarow + row_index, heights[row_index])
+        for col_index, value in enumerate(row):
+            fmt = cell_format(styles[col_index][row_index])
+            link = links[col_index][row_index] if links[col_index] is not None else None
+            if link is None or (isinstance(link, float) and link != link):
+                write_cell(sheet, datarow + row_index, startcol + col_index, value, fmt)
+            else:
+                write_link(sheet, datarow + row_index, startcol + col_index, value, fmt, link)
+
+    if xf._table_args:
+        rows = None if not xf.dataframe.empty else (0, 1)
+        ref = xf._get_range_as_str(row_index=rows, startcol=datacol, startrow=startrow, index=index)
+        sheet.add_table(ref, table_options(xf._table_args, [
+            {'header': str(value), 'header_format': cell_format(style)}
+            for value, style in zip(header_values, header_styles)
+        ]))
+    elif add_filters:
+        sheet.autofilter(xf._get_range_as_str(row_index=0, startcol=datacol, startrow=startrow, index=index))
+
+    for rule, ref in xf._conditional_format_ranges(startcol=datacol, startrow=datarow):
+        options = conditional_format_options(rule, book)
+        ranges = ref.split()
+        if len(ranges) > 1:
+            options['multi_range'] = ref
+        sheet.conditional_format(ranges[0], options)
+
+    return sheet
+
+
+def write_cell(sheet, row, col, value, fmt):
+    """
+    Write value with the xlsxwriter method matching the type openpyxl would give it.
+    """
+    kind = type(value)
+    if kind is int or kind is float:
+        return sheet.write_number(row, col, value, fmt)
+    if value is None or value == '':
+        return sheet.write_blank(row, col, None, fmt)
+    if kind is str:
+        if len(value) > 1 and value.startswith('='):
+            return sheet.write_formula(row, col, value, fmt)
+        return sheet.write_string(row, col, value, fmt)
+    if kind is bool:
+        return sheet.write_boolean(row, col, value, fmt)
+    if hasattr(value, 'year'):
+        return sheet.write_datetime(row, col, value, fmt)
+    return write_cell(sheet, row, col, _streaming.excel_value(value), fmt)
+
+
+def write_link(sheet, row, col, value, fmt, link):
+    """
+    Write hyperlink to cell. xlsxwriter writes links as strings so value is written as its string.
+
+    :param link: Link target or openpyxl Hyperlink.
+    :type link: str or openpyxl.worksheet.hyperlink.Hyperlink
+    """
+    tip = None
+    if isinstance(link, _Hyperlink):
+        tip = link.tooltip
+        link = link.target if link.target else 'internal:{}'.format(link.location)
+    if value is None or value == '':
+        value = None
+    elif not isinstance(value, str):
+        value = str(value)
+    return sheet.write_url(row, col, link, fmt, value, tip)
+
+
+def column_width(width):
+    """
+    Convert width as written by openpyxl to the width to give xlsxwriter.
+    xlsxwriter pads widths the same as Excel's column width dialog. openpyxl writes them as given.
+
+    :param width: openpyxl column width.
+    :type width: float
+    :return: xlsxwriter column width.
+    :rtype: float
+    """
+    padded = width - 5 / 7
+    return padded if padded >= 1 else width * 7 / 12
+
+
+def table_options(table_args, columns):
+    """
+    Translate openpyxl table args into xlsxwriter add_table options.
+
+    :param table_args: XlFrame table args. See XlFrame.format_as_table.
+    :type table_args: dict
+    :param columns: xlsxwriter column options.
+    :type columns: list of dict
+    :return: dict
+    """
+    options = {'columns': columns, 'style': None, 'banded_rows': False}
+    name = table_args.get('displayName', table_args.get('name'))
+    if name is not None:
+        options['name'] = name
+    style_info = table_args.get('tableStyleInfo')
+    if style_info is not None:
+        options.update({
+            'style': style_info.name,
+            'first_column': bool(style_info.showFirstColumn),
+            'last_column': bool(style_info.showLastColumn),
+            'banded_rows': bool(style_info.showRowStripes),
+            'banded_columns': bool(style_info.showColumnStripes),
+        })
+    return options
+
+
+def format_properties(style):
+    """
+    Translate style into xlsxwriter format properties.
+    Theme colors and gradient fills have no xlsxwriter equivalent and are left out.
+
+    :param style: Style to translate.
+    :type style: openpyxl.styles.NamedStyle
+    :return: Properties for xlsxwriter.Workbook.add_format.
+    :rtype: dict
+    """
+    props = dict()
+
+    font = style.font
+    if font.name is not None:
+        props['font_name'] = font.name
+    if font.sz is not None:
+        props['font_size'] = font.sz
+    if font.b:
+        props['bold'] = True
+    if font.i:
+        props['italic'] = True
+    if font.u in UNDERLINES:
+        props['underline'] = UNDERLINES[font.u]
+    if font.strike:
+        props['font_strikeout'] = True
+    if font.vertAlign in ('superscript', 'subscript'):
+        props['font_script'] = 1 if font.vertAlign == 'superscript' else 2
+    _set_color(props, 'font_color', font.color)
+
+    fill = style.fill
+    pattern = PATTERNS.get(getattr(fill, 'patternType', None), 0)
+    if pattern:
+        props['pattern'] = pattern
+        _set_color(props, 'fg_color', fill.fgColor)
+        _set_color(props, 'bg_color', fill.bgColor)
+        if pattern == 1 and 'fg_color' in props and 'bg_color' in props:
+            # xlsxwriter swaps solid fill colors when both are given.
+            props['fg_color'], props['bg_color'] = props['bg_color'], props['fg_color']
+
+    for side in ('left', 'right', 'top', 'bottom'):
+        border = getattr(style.border, side)
+        if border is not None and BORDERS.get(border.style, 0):
+            props[side] = BORDERS[border.style]
+            _set_color(props, '{}_color'.format(side), border.color)
+
+    alignment = style.alignment
+    if alignment.horizontal is not None:
+        props['align'] = HORIZONTAL.get(alignment.horizontal, alignment.horizontal)
+    if alignment.vertical is not None:
+        props['valign'] = VERTICAL.get(alignment.vertical, alignment.vertical)
+    if alignment.wrap_text:
+        props['text_wrap'] = True
+    if alignment.shrink_to_fit:
+        props['shrink'] = True
+    if alignment.indent:
+        props['indent'] = int(alignment.indent)
+    if alignment.text_rotation:
+        rotation = int(alignment.text_rotation)
+        props['rotation'] = 270 if rotation == 255 else rotation if rotation <= 90 else 90 - rotation
+
+    if style.number_format is not None:
+        props['num_format'] = style.number_format
+
+    if style.protection.locked is False:
+        props['locked'] = False
+    if style.protection.hidden:
+        props['hidden'] = True
+
+    return props
+
+
+def conditional_format_options(rule, book):
+    """
+    Translate openpyxl conditional formatting rule into xlsxwriter conditional_format options.
+
+    :param rule: Rule to translate.
+    :type rule: openpyxl.formatting.rule.Rule
+    :param book: xlsxwriter workbook to add the rule's format to.
+    :return: dict
+    """
+    kind = rule.type
+    if kind == 'colorScale':
+        scale = rule.colorScale
+        points = ('min', 'mid', 'max') if len(scale.cfvo) == 3 else ('min', 'max')
+        options = {'type': '{}_color_scale'.format(len(points))}
+        for point, cfvo, color in zip(points, scale.cfvo, scale.color):
+            _set_cfvo(options, point, cfvo)
+            _set_color(options, '{}_color'.format(point), color)
+    elif kind == 'dataBar':
+        bar = rule.dataBar
+        options = {'type': 'data_bar'}
+        for point, cfvo in zip(('min', 'max'), bar.cfvo):
+            _set_cfvo(options, point, cfvo)
+        _set_color(options, 'bar_color', bar.color)
+        if bar.showValue is False:
+            options['bar_only'] = True
+    elif kind == 'iconSet':
+        icon_set = rule.iconSet
+        options = {
+            'type': 'icon_set',
+            'icon_style': ICON_STYLES[icon_set.iconSet or '3TrafficLights1'],
+            # openpyxl thresholds go from the lowest icon up, xlsxwriter's from the highest down.
+            'icons': [
+                {'criteria': '>' if cfvo.gte is False else '>=', 'type': 'number' if cfvo.type == 'num' else cfvo.type,
+                 'value': cfvo.val}
+                for cfvo in reversed(icon_set.cfvo[1:])
+            ],
+        }
+        if icon_set.reverse:
+            options['reverse_icons'] = True
+        if icon_set.showValue is False:
+            options['icons_only'] = True
+    elif kind == 'cellIs':
+        options = {'type': 'cell', 'criteria': OPERATORS[rule.operator]}
+        if rule.operator in ('between', 'notBetween'):
+            options['minimum'], options['maximum'] = rule.formula[:2]
+        else:
+            options['value'] = rule.formula[0]
+    elif kind == 'expression':
+        options = {'type': 'formula', 'criteria': rule.formula[0]}
+    elif kind == 'top10':
+        options = {'type': 'bottom' if rule.bottom else 'top', 'value': rule.rank}
+        if rule.percent:
+            options['criteria'] = '%'
+    elif kind == 'aboveAverage':
+        direction = 'below' if rule.aboveAverage is False else 'above'
+        if rule.stdDev:
+            criteria = '{} std dev {}'.format(int(rule.stdDev), direction)
+        elif rule.equalAverage:
+            criteria = 'equal or {}'.format(direction)
+        else:
+            criteria = direction
+        options = {'type': 'average', 'criteria': criteria}
+    elif kind in TEXT_RULES:
+        options = {'type': 'text', 'criteria': TEXT_RULES[kind], 'value': rule.text}
+    elif kind in VALUE_RULES:
+        options = {'type': VALUE_RULES[kind]}
+    else:
+        raise NotImplementedError('Conditional format type {} not supported by xlsxwriter export.'.format(kind))
+
+    if rule.dxf is not None and kind not in ('colorScale', 'dataBar', 'iconSet'):
+        options['format'] = book.add_format(dxf_properties(rule.dxf))
+    if rule.stopIfTrue:
+        options['stop_if_true'] = True
+    return options
+
+
+def dxf_properties(dxf):
+    """
+    Translate conditional format's differential style into xlsxwriter format properties.
+
+    :param dxf: Differential style to translate.
+    :type dxf: openpyxl.styles.differential.DifferentialStyle
+    :return: dict
+    """
+    props = format_properties(_Formats(
+        font=dxf.font or _Font(), fill=_PatternFill(), border=dxf.border or _Border(),
+        alignment=dxf.alignment or _Alignment(), number_format=dxf.numFmt.formatCode if dxf.numFmt else None,
+        protection=dxf.protection or _Protection(),
+    ))
+    fill = dxf.fill
+    if isinstance(fill, _PatternFill):
+        # Fill colors of conditional formats are written as given, solid or not.
+        if fill.patternType is not None:
+            props['pattern'] = PATTERNS.get(fill.patternType, 0)
+        for key, color in (('fg_color', fill.fgColor), ('bg_color', fill.bgColor)):
+            if color != _Color():
+                _set_color(props, key, color)
+    return props
+
+
+def _set_cfvo(options, point, cfvo):
+    options['{}_type'.format(point)] = cfvo.type
+    if cfvo.val is not None:
+        options['{}_value'.format(point)] = cfvo.val
+
+
+def _set_color(props, key, color):
+    if color is None:
+        return
+    if color.type == 'rgb' and isinstance(color.rgb, str):
+        props[key] = '#' + color.rgb[-6:]
+    elif color.type == 'indexed' and color.indexed < len(_COLOR_INDEX):
+        props[key] = '#' + _COLOR_INDEX[color.indexed][-6:]
+
+
+if __name__ == '__main__':
+    pass